@@ -1,17 +1,24 @@
+import functools
 import json
 from pathlib import Path
 from typing import List, Dict
 import numpy as np
 import pandas as pd
 from gensim.models import Word2Vec
-from sklearn.metrics.pairwise import cosine_similarity
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # -------------------------
 # Helpers
 # -------------------------
+@functools.lru_cache(maxsize=None)
 def phrase_token(s: str) -> str:
     """Make a single token from a phrase (lowercase, spaces->underscores)."""
-    return "_".join(s.strip().lower().split())
+    return "_".join(s.lower().split())
 
 def extract_category_tokens(rec: Dict) -> Dict[str, List[str]]:
     """Extract tokens for the four categories from a single record."""
@@ -49,11 +56,14 @@ def record_to_sentence(rec: Dict) -> List[str]:
     return cats["education"] + cats["occupation"] + cats["interest"] + cats["nationality"]
 
 def mean_vector(model: Word2Vec, tokens: List[str]) -> np.ndarray:
-    vecs = [model.wv[t] for t in tokens if t in model.wv]
-    if not vecs:
+    kv = model.wv
+    # Gather all known token rows in one fancy-index instead of a per-token lookup
+    idx = np.fromiter((kv.key_to_index.get(t, -1) for t in tokens), dtype=np.int64, count=len(tokens))
+    idx = idx[idx >= 0]
+    if not idx.size:
         # if no tokens present (e.g., empty interests), return zeros
         return np.zeros(model.vector_size, dtype=np.float32)
-    return np.mean(vecs, axis=0)
+    return kv.vectors[idx].mean(axis=0).astype(np.float32, copy=False)
 
 # -------------------------
 # Load data (JSONL)
@@ -61,24 +71,15 @@ def mean_vector(model: Word2Vec, tokens: List[str]) -> np.ndarray:
 jsonl_path = Path("../astronauts_structured_fixed.jsonl")
 jsonl_non_astronauts_path = Path("../non_astronauts_600.jsonl")
 
-sentences: List[List[str]] = []
-records: List[Dict] = []
-
-with open(r'C:\Users\ltkie\OneDrive\Documents\UNC\Fall25\CDC25\Model\astronauts_structured_fixed.jsonl', "r", encoding="utf-8") as f:
-    for line in f:
-        if not line.strip():
-            continue
-        rec = json.loads(line)
-        records.append(rec)
-        sentences.append(record_to_sentence(rec))
-
-with open(r'C:\Users\ltkie\OneDrive\Documents\UNC\Fall25\CDC25\Model\non_astronauts_600.jsonl', "r", encoding="utf-8") as f:
-    for line in f:
-        if not line.strip():
-            continue
-        rec = json.loads(line)
-        records.append(rec)
-        sentences.append(record_to_sentence(rec))
+def load_jsonl(path: Path) -> List[Dict]:
+    # Read the file in one go and parse each non-blank line (orjson when available)
+    return [_json_loads(line) for line in path.read_bytes().splitlines() if line.strip()]
+
+records: List[Dict] = (
+    load_jsonl(Path(r'C:\Users\ltkie\OneDrive\Documents\UNC\Fall25\CDC25\Model\astronauts_structured_fixed.jsonl'))
+    + load_jsonl(Path(r'C:\Users\ltkie\OneDrive\Documents\UNC\Fall25\CDC25\Model\non_astronauts_600.jsonl'))
+)
+sentences: List[List[str]] = [record_to_sentence(rec) for rec in records]
 
 # If you only have a single line (like the one you pasted), this still works—min_count=1 ensures training.
 # -------------------------
@@ -99,16 +100,18 @@ model.save("word2vec_people_categories.model")
 # -------------------------
 # Build per-person embeddings by category and a concatenated feature
 # -------------------------
+D = model.vector_size
+X = np.empty((len(records), 4 * D), dtype=np.float32)  # one contiguous row per person
+
 rows = []
-for rec in records:
+for i, rec in enumerate(records):
     cats = extract_category_tokens(rec)
-    v_edu = mean_vector(model, cats["education"])
-    v_occ = mean_vector(model, cats["occupation"])
-    v_int = mean_vector(model, cats["interest"])
-    v_nat = mean_vector(model, cats["nationality"])
-
-    # Concatenate the four category vectors into one feature vector
-    v_concat = np.concatenate([v_edu, v_occ, v_int, v_nat], axis=0)
+    # Write the four category vectors straight into this person's row
+    X[i, 0:D] = mean_vector(model, cats["education"])
+    X[i, D:2*D] = mean_vector(model, cats["occupation"])
+    X[i, 2*D:3*D] = mean_vector(model, cats["interest"])
+    X[i, 3*D:4*D] = mean_vector(model, cats["nationality"])
+    v_concat = X[i]
 
     rows.append({
         "name": rec.get("name"),
@@ -158,12 +161,16 @@ def embed_person(model: Word2Vec, rec: Dict, cat_weights=None) -> np.ndarray:
 user_emb = embed_person(model, user_profile)
 
 # ---------- Similarity computation ----------
-astro_mat = np.vstack(df["embedding_concat"].values)  # (N, 4*vector_size)
-user_mat = user_emb.reshape(1, -1)                               # (1, 4*vector_size)
-sims = cosine_similarity(user_mat, astro_mat).ravel()            # (N,)
+# L2-normalize the astronaut rows once so cosine similarity is a single dot product
+astro_mat = X                                                                       # (N, 4*vector_size)
+astro_norm = astro_mat / np.clip(np.linalg.norm(astro_mat, axis=1, keepdims=True), 1e-12, None)
+u = user_emb / max(np.linalg.norm(user_emb), 1e-12)                                 # (4*vector_size,)
+sims = astro_norm @ u                                                               # (N,)
 
 top_k = 3
-rank_idx = np.argsort(-sims)[:top_k]
+# Partial selection of the top_k rows, then sort only those
+part = np.argpartition(-sims, top_k - 1)[:top_k]
+rank_idx = part[np.argsort(-sims[part])]
 
 print("Top similar astronauts:")
 for rank, idx in enumerate(rank_idx, 1):
@@ -2,6 +2,15 @@ import numpy as np
 import ast
 import re
 
+# A whole word ending in a period (e.g., "H.", "Jr.") and runs of two or more whitespace characters
+_DOTTED_WORD_RE = re.compile(r'\b[A-Za-z]+\.')
+_MULTI_SPACE_RE = re.compile(r'\s\s+')
+
+# Degree keywords; 'doctor' also covers 'doctorate' and 'doctoral'. ASCII-only case folding, so every
+# match lowercases to a _DEGREE_LEVELS key (no 'ſ' matching 's', as str.lower() never did)
+_DEGREE_RE = re.compile(r'doctor|phd|master|bachelor', re.IGNORECASE | re.ASCII)
+_DEGREE_LEVELS = {'doctor': 'doctor', 'phd': 'doctor', 'master': 'master', 'bachelor': 'bachelor'}
+
 def convert_to_list(data):
     """
     Hàm này chuyển đổi một chuỗi có định dạng list thành một list thực sự.
@@ -32,11 +41,11 @@ def remove_dotted_words(name_string: str) -> str:
     # 1. Find and remove any whole word ending in a period (e.g., "H.", "Jr.").
     #    The pattern \b[A-Za-z]+\. finds a word boundary, one or more letters,
     #    and a literal period.
-    cleaned_name = re.sub(r'\b[A-Za-z]+\.', '', name_string)
+    cleaned_name = _DOTTED_WORD_RE.sub('', name_string)
 
     # 2. Clean up any extra whitespace that may have been left behind.
     #    The pattern \s\s+ finds two or more spaces and replaces them with one.
-    cleaned_name = re.sub(r'\s\s+', ' ', cleaned_name)
+    cleaned_name = _MULTI_SPACE_RE.sub(' ', cleaned_name)
 
     # 3. Remove any leading/trailing spaces or commas.
     return cleaned_name.strip(' ,')
@@ -85,15 +94,15 @@ def find_degree_level(degree_string):
     if not isinstance(degree_string, str):
         return None
 
-    # Convert the string to lowercase for case-insensitive matching
-    lower_string = degree_string.lower()
+    # Collect every degree keyword in a single case-insensitive pass
+    found = {_DEGREE_LEVELS[m.lower()] for m in _DEGREE_RE.findall(degree_string)}
 
     # Check for keywords in order of precedence (doctor > master > bachelor)
-    if 'doctor' in lower_string or 'doctorate' in lower_string or 'doctoral' in lower_string or 'phd' in lower_string:
+    if 'doctor' in found:
         return 'doctor'
-    elif 'master' in lower_string:
+    elif 'master' in found:
         return 'master'
-    elif 'bachelor' in lower_string:
+    elif 'bachelor' in found:
         return 'bachelor'
     
     return None
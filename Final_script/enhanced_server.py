@@ -1,38 +1,143 @@
 
 # Enhanced server.py with resume parsing and AI advice
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from final_functions import find_similar_astronauts
+from final_functions import find_similar_astronauts, preload as preload_matching, MODEL_PATH, DF_PATH
 import traceback
+import functools
 import pandas as pd
 import logging
 from typing import List, Dict, Any
 import os
 import re
 import json
+import base64
+import threading
+import time
 from werkzeug.utils import secure_filename
 import openai
+import requests
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from face_swap import process_face_swap
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+class _OrjsonRequestProvider(DefaultJSONProvider):
+    """Parses request bodies (request.get_json) with orjson; responses already go through _json"""
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
-logging.basicConfig(level=logging.INFO)
+if ORJSON_AVAILABLE:
+    # Selfie uploads are multi-megabyte base64 strings inside the JSON body
+    app.json = _OrjsonRequestProvider(app)
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
 log = logging.getLogger(__name__)
 
 # Configuration
 CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Data Analysis', 'astronauts.csv')
+SUIT_IMAGE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'frontend', 'public', 'astronaut-suit.png')
+
+# Opt-in pyarrow CSV reader (ASTRO_FAST_IO=1); otherwise pandas' default C parser.
+# The pyarrow path also keeps the columns Arrow-backed instead of object dtype (~3.5x less memory);
+# missing cells then come back as pd.NA, which _json serializes as null.
+CSV_READ_OPTS = {"engine": "c"}
+if os.getenv('ASTRO_FAST_IO') == '1':
+    try:
+        import pyarrow  # noqa: F401
+        CSV_READ_OPTS = {"engine": "pyarrow", "dtype_backend": "pyarrow"}
+    except ImportError:
+        log.warning("ASTRO_FAST_IO=1 but pyarrow is not installed; using the default CSV parser")
 
 # OpenAI configuration (you'll need to set your API key)
 openai.api_key = os.getenv('OPENAI_API_KEY', None)
 
+# The openai client keeps one HTTP session per thread, and the dev server starts a thread
+# per request, so every call paid a fresh TCP + TLS handshake. Share one pooled
+# keep-alive session across all request threads instead.
+_openai_session = requests.Session()
+_openai_session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=32, max_retries=2))
+openai.requestssession = _openai_session
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+def _parse_reset(value) -> float:
+    """Seconds in an x-ratelimit-reset-* header value such as '6m0s' or '20ms'"""
+    return sum(float(n) * _DURATION_SECONDS[u] for n, u in _DURATION_RE.findall(value or ""))
+
+class _RateLimiter:
+    """Tracks OpenAI's x-ratelimit-* response headers and sleeps before a call that the API
+    would reject with a 429, instead of spending a round trip on the error"""
+
+    MAX_WAIT = 60.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests_remaining = None
+        self.tokens_remaining = None
+        self.requests_reset_at = 0.0
+        self.tokens_reset_at = 0.0
+
+    def update(self, response, *args, **kwargs):
+        """requests response hook on the shared OpenAI session"""
+        headers = response.headers
+        if "x-ratelimit-remaining-requests" not in headers:
+            return
+        now = time.monotonic()
+        try:
+            with self._lock:
+                self.requests_remaining = int(headers["x-ratelimit-remaining-requests"])
+                self.requests_reset_at = now + _parse_reset(headers.get("x-ratelimit-reset-requests"))
+                if "x-ratelimit-remaining-tokens" in headers:
+                    self.tokens_remaining = int(headers["x-ratelimit-remaining-tokens"])
+                    self.tokens_reset_at = now + _parse_reset(headers.get("x-ratelimit-reset-tokens"))
+        except ValueError:
+            log.debug("Unparseable rate limit headers: %s", dict(headers))
+
+    def wait(self, tokens: int = 0):
+        """Block until the last reported limits leave room for one request of ~tokens tokens"""
+        with self._lock:
+            now = time.monotonic()
+            delay = 0.0
+            if self.requests_remaining is not None:
+                if self.requests_remaining < 1:
+                    delay = self.requests_reset_at - now
+                # reserve the slot so concurrent callers don't all spend the last one
+                self.requests_remaining -= 1
+            if self.tokens_remaining is not None and self.tokens_remaining < tokens:
+                delay = max(delay, self.tokens_reset_at - now)
+        if delay > 0:
+            delay = min(delay, self.MAX_WAIT)
+            log.info("OpenAI rate limit nearly exhausted, waiting %.2fs", delay)
+            time.sleep(delay)
+
+_rate_limiter = _RateLimiter()
+_openai_session.hooks["response"].append(_rate_limiter.update)
+
 
 # Name matching functions (existing code)
-SUFFIXES = {"jr", "jr.", "sr", "sr.", "ii", "iii", "iv", "v"}
+SUFFIXES = frozenset({"jr", "jr.", "sr", "sr.", "ii", "iii", "iv", "v"})
+_TOKEN_RE = re.compile(r"[^\w\-']")
 
 def _norm_token(s: str) -> str:
-    return re.sub(r"[^\w\-']", "", s.casefold()).strip()
+    return _TOKEN_RE.sub("", s.casefold()).strip()
 
+@functools.lru_cache(maxsize=8192)
 def _normalize_name(name: str) -> str:
     """Normalize name to 'Firstname Lastname' format for consistent matching"""
     if not name or not name.strip():
@@ -64,30 +169,38 @@ def _normalize_name(name: str) -> str:
     
     return ""
 
-def _split_candidate_name(full: str):
-    parts = full.strip().split()
-    if not parts:
-        return None, None
-    first = _norm_token(parts[0])
-    last = _norm_token(parts[-1])
-    if last == first and len(parts) == 1:
-        return first, None
-    return first, last
-
-def _split_csv_name(csv_name: str):
-    left, sep, right = csv_name.partition(",")
-    last = _norm_token(left) if sep else _norm_token(csv_name)
-    first = ""
-    if sep:
-        right_tokens = [_norm_token(t) for t in right.strip().split()]
-        right_tokens = [t for t in right_tokens if t and t not in SUFFIXES]
-        first = right_tokens[0] if right_tokens else ""
-    return first, last
-
-def get_profiles_from_names(names: List[str], csv_path: str = CSV_PATH) -> Dict[str, Dict[str, Any]]:
-    """Get profiles from CSV with robust name matching. Returns dict mapping normalized name -> profile"""
+def _normalize_names(names: pd.Series) -> pd.Series:
+    """Column-wise _normalize_name: same rules, run through pandas .str ops"""
+    names = names.fillna("").astype(str)
+
+    def _tokens(col: pd.Series) -> pd.Series:
+        # one row per whitespace token (index repeats the source row), normalized like _norm_token
+        tok = col.str.split().explode()
+        tok = tok.str.casefold().str.replace(_TOKEN_RE, "", regex=True).str.strip()
+        return tok[tok.notna() & ~tok.isin(SUFFIXES)].str.title()
+
+    # Regular format - first and last non-empty, non-suffix token
+    parts = _tokens(names)
+    parts = parts[parts != ""].groupby(level=0)
+    first = parts.first().reindex(names.index, fill_value="")
+    last = parts.last().reindex(names.index, fill_value="")
+    count = parts.size().reindex(names.index, fill_value=0)
+    out = first.where(count < 2, first + " " + last)
+
+    # Comma-separated format "Last, First Middle" - first token on each side of the first comma
+    left, sep, right = (names.str.partition(",")[i] for i in range(3))
+    last_first = _tokens(left).groupby(level=0).first()
+    first_first = _tokens(right).groupby(level=0).first()
+    comma = (sep != "") & (count > 0) & names.index.isin(last_first.index) & names.index.isin(first_first.index)
+    out[comma] = first_first.reindex(names.index)[comma] + " " + last_first.reindex(names.index)[comma]
+    return out
+
+@functools.lru_cache(maxsize=1)
+def _load_profiles(csv_path: str, mtime: float):
+    """Read and index the astronaut CSV once per (path, mtime).
+    Returns (df, normalized name -> row position, lowercase word -> row positions, row dicts)"""
     try:
-        df = pd.read_csv(csv_path)
+        df = pd.read_csv(csv_path, **CSV_READ_OPTS)
     except FileNotFoundError:
         raise FileNotFoundError(f"CSV not found at {csv_path}")
 
@@ -95,10 +208,38 @@ def get_profiles_from_names(names: List[str], csv_path: str = CSV_PATH) -> Dict[
         raise KeyError("CSV must contain a 'Profile.Name' column")
 
     # Create normalized name column for matching
-    if '___normalized_name' not in df.columns:
-        df['___normalized_name'] = df['Profile.Name'].fillna("").apply(_normalize_name)
+    df['___normalized_name'] = _normalize_names(df['Profile.Name'])
+
+    # First row wins for duplicate names, same as taking iloc[0] of a mask
+    by_norm = {}
+    for pos, norm in enumerate(df['___normalized_name']):
+        if norm:
+            by_norm.setdefault(norm, pos)
+    # Inverted word index for fuzzy matching: only rows sharing a word can reach the score cutoff
+    token_index = {}
+    for pos, norm in enumerate(df['___normalized_name']):
+        for word in set(norm.lower().split()):
+            token_index.setdefault(word, []).append(pos)
+    # Rows as plain dicts, built once in one columnar pass; lookups copy from here
+    records = df.to_dict(orient='records')
+    return df, by_norm, token_index, records
+
+def _get_profiles_table(csv_path: str = CSV_PATH):
+    """Cached CSV table; re-read only when the file's mtime changes"""
+    try:
+        mtime = os.path.getmtime(csv_path)
+    except OSError:
+        raise FileNotFoundError(f"CSV not found at {csv_path}")
+    return _load_profiles(csv_path, mtime)
+
+def get_profiles_from_names(names: List[str], csv_path: str = CSV_PATH) -> Dict[str, Dict[str, Any]]:
+    """Get profiles from CSV with robust name matching. Returns dict mapping normalized name -> profile"""
+    if not names:
+        return {}
+    df, by_norm, token_index, records = _get_profiles_table(csv_path)
 
     found_profiles = {}
+    tried = set()
     
     for name in names:
         if not isinstance(name, str) or not name.strip():
@@ -107,47 +248,70 @@ def get_profiles_from_names(names: List[str], csv_path: str = CSV_PATH) -> Dict[
         normalized_search = _normalize_name(name)
         if not normalized_search:
             continue
+        # Resolve each distinct name once; a repeat would redo the same (possibly fuzzy) search
+        if normalized_search in tried:
+            continue
+        tried.add(normalized_search)
             
-        log.info(f"Looking for '{name}' -> normalized: '{normalized_search}'")
+        log.debug("Looking for '%s' -> normalized: '%s'", name, normalized_search)
         
         # Try exact match first
-        exact_matches = df[df['___normalized_name'] == normalized_search]
-        if not exact_matches.empty:
-            profile = exact_matches.iloc[0].to_dict()
+        exact_pos = by_norm.get(normalized_search)
+        if exact_pos is not None:
+            profile = dict(records[exact_pos])
             found_profiles[normalized_search] = profile
-            log.info(f"✅ Found exact match: {profile['Profile.Name']}")
+            log.debug("✅ Found exact match: %s", profile['Profile.Name'])
             continue
             
-        # Try fuzzy matching
+        # Try fuzzy matching, scoring only the rows that share at least one word
         best_match = None
         best_score = 0
+        search_words = set(normalized_search.lower().split())
+        candidates = set()
+        for word in search_words:
+            candidates.update(token_index.get(word, ()))
+        csv_names = df['___normalized_name']
         
-        for idx, csv_name in df['___normalized_name'].items():
-            if not csv_name:
-                continue
-                
+        for idx in sorted(candidates):
             # Simple similarity score based on common words
-            search_words = set(normalized_search.lower().split())
-            csv_words = set(csv_name.lower().split())
+            csv_words = set(csv_names.iat[idx].lower().split())
+            intersection = len(search_words & csv_words)
+            union = len(search_words | csv_words)
+            score = intersection / union if union > 0 else 0
             
-            if search_words and csv_words:
-                intersection = len(search_words & csv_words)
-                union = len(search_words | csv_words)
-                score = intersection / union if union > 0 else 0
-                
-                if score > best_score and score >= 0.5:  # At least 50% similarity
-                    best_score = score
-                    best_match = idx
+            if score > best_score and score >= 0.5:  # At least 50% similarity
+                best_score = score
+                best_match = idx
+        
+        # No row reaches the Jaccard threshold: catch a typo in the name with rapidfuzz's native scorer (strict cutoff)
+        if best_match is None and RAPIDFUZZ_AVAILABLE:
+            typo = process.extractOne(normalized_search, csv_names, scorer=fuzz.token_sort_ratio,
+                                      processor=str.lower, score_cutoff=90)
+            if typo is not None:
+                best_score = typo[1] / 100
+                best_match = typo[2]
         
         if best_match is not None:
-            profile = df.iloc[best_match].to_dict()
+            profile = dict(records[best_match])
             found_profiles[normalized_search] = profile
-            log.info(f"✅ Found fuzzy match: {name} -> {profile['Profile.Name']} (score: {best_score:.2f})")
+            log.debug("✅ Found fuzzy match: %s -> %s (score: %.2f)", name, profile['Profile.Name'], best_score)
         else:
-            log.warning(f"❌ No match found for: {name}")
+            log.warning("❌ No match found for: %s", name)
     
     return found_profiles
 
+# Load the CSV at import time so a gunicorn --preload master shares it copy-on-write with its workers
+try:
+    _get_profiles_table()
+except (FileNotFoundError, KeyError) as e:
+    log.warning("Astronaut CSV not preloaded: %s", e)
+# Any load failure (missing file, corrupt or incompatible pickle/model) is logged rather than raised so
+# the other endpoints still come up; /similar_astronauts then retries the load and fails per request
+try:
+    preload_matching()
+except Exception as e:
+    log.warning("Matching model not preloaded: %s", e)
+
 def extract_names(items: List[Dict[str, Any]]) -> List[str]:
     names = []
     for a in items:
@@ -158,203 +322,386 @@ def extract_names(items: List[Dict[str, Any]]) -> List[str]:
     return names
 
 
+@functools.lru_cache(maxsize=4096)
+def _chat(system: str, prompt: str, max_tokens: int, temperature: float = 0.7, json_mode: bool = False) -> str:
+    """Chat completion for fully rendered system/user messages. The prompts embed every input,
+    so repeat advice/biography/timeline requests skip the API call; failures are not cached.
+    json_mode makes OpenAI return a JSON object (the system message must ask for one); a reply that still
+    doesn't parse, e.g. cut off at max_tokens, raises ValueError so it isn't cached either"""
+    _rate_limiter.wait(max_tokens)
+    extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+    response = openai.ChatCompletion.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=max_tokens,
+        temperature=temperature,
+        **extra
+    )
+    # usage.prompt_tokens_details.cached_tokens shows how much of the shared prefix was reused
+    log.debug("OpenAI usage: %s", response.get("usage"))
+    content = response.choices[0].message.content.strip()
+    if json_mode:
+        _loads_json(content)
+    return content
+
+def _loads_json(text: str):
+    """Parse a model's JSON reply with orjson when installed; both raise a ValueError subclass on bad JSON"""
+    return orjson.loads(text) if ORJSON_AVAILABLE else json.loads(text)
+
+def _chat_stream(system: str, prompt: str, max_tokens: int, temperature: float = 0.7):
+    """Yield the completion text piece by piece as OpenAI produces it (not cached)"""
+    _rate_limiter.wait(max_tokens)
+    response = openai.ChatCompletion.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=max_tokens,
+        temperature=temperature,
+        stream=True
+    )
+    for chunk in response:
+        piece = chunk.choices[0].delta.get("content")
+        if piece:
+            yield piece
+
+def _sse_text(pieces, fallback: str):
+    """Stream text pieces as server-sent events: {"delta": ...} per piece, then {"done": true}.
+    Sends the fallback text instead if OpenAI fails before the first piece"""
+    def generate():
+        sent = False
+        try:
+            for piece in pieces:
+                sent = True
+                yield f"data: {json.dumps({'delta': piece})}\n\n"
+        except Exception as e:
+            log.error("Error streaming completion from OpenAI: %s", e)
+            if sent:
+                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            else:
+                yield f"data: {json.dumps({'delta': fallback})}\n\n"
+        yield 'data: {"done": true}\n\n'
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+_FALLBACK_ADVICE = """
+        Based on your {score:.1%} similarity with {name}, 
+        you share a strong foundation for a space career. Your background in {occupations} 
+        aligns well with the astronaut's path. Consider developing skills in leadership, technical expertise, 
+        and teamwork - all crucial for space missions. Pursue advanced education in STEM fields, gain 
+        experience in high-pressure environments, and consider military or research positions that build 
+        the resilience and expertise needed for space exploration.
+        """
+
+def _as_score(similarity_score):
+    # similarity_score comes straight from the request body; a numeric string still formats, anything else is 0
+    try:
+        return float(similarity_score)
+    except (TypeError, ValueError):
+        return 0.0
+
+def _fallback_advice(user_profile, astronaut_match, similarity_score):
+    """Canned career advice used when OpenAI is unavailable"""
+    # Non-string occupations must not break the fallback either
+    score = _as_score(similarity_score)
+    occupations = user_profile.get('occupations', ['your field'])
+    try:
+        occupations = ', '.join(str(o) for o in ([occupations] if isinstance(occupations, str) else occupations))
+    except TypeError:
+        occupations = 'your field'
+    return _FALLBACK_ADVICE.format(score=score,
+                                   name=astronaut_match.get('name', 'this astronaut'),
+                                   occupations=occupations)
+
+def _fallback_biography(astronaut_name, nationality, mission_count, mission_duration, role):
+    """Canned biography used when OpenAI is unavailable"""
+    return f"{astronaut_name} is a distinguished astronaut from {nationality} with {mission_count} space missions and {mission_duration} days in space. Their role as {role} demonstrates their expertise and dedication to space exploration."
+
+_FALLBACK_TIMELINE = (
+    "Selected for astronaut training program",
+    "Completed intensive space mission preparation",
+    "First space mission launch",
+    "Advanced to senior astronaut role",
+    "Retired from active space missions",
+)
+
+# Static instructions live in the system messages and only the per-request inputs go in the user
+# message, so every call to an endpoint starts with a byte-identical prefix that OpenAI's automatic
+# prompt caching can reuse
+_ADVICE_INSTRUCTIONS = """Given a user profile and the astronaut they matched with, provide personalized career advice in 2-3 paragraphs that:
+1. Explains why this astronaut is a good match for the user
+2. Provides specific recommendations for skills to develop
+3. Suggests career paths or experiences to pursue
+4. Includes motivational and inspiring language about space careers
+
+Make the advice practical, actionable, and encouraging. Focus on concrete next steps the user can take."""
+
+_ADVICE_SYSTEM = ("You are an expert career counselor specializing in space careers and astronaut development.\n\n"
+                  + _ADVICE_INSTRUCTIONS)
+
+_BIOGRAPHY_SYSTEM = """You are a space historian writing inspiring astronaut biographies.
+
+Write a brief, inspiring biography (2-3 sentences) for the astronaut described.
+Make it engaging and highlight their achievements."""
+
+_BIOGRAPHIES_SYSTEM = """You are a space historian writing inspiring astronaut biographies. Return only valid JSON objects.
+
+Write a brief, inspiring biography (2-3 sentences) for each numbered astronaut described.
+Make them engaging and highlight their achievements.
+Return only a JSON object with the key "biographies": an array of strings, one per astronaut, in the same order."""
+
+_TIMELINE_SYSTEM = """You are a space career analyst. Return only valid JSON objects.
+
+Create 5 career milestones for the astronaut described.
+Each milestone should be exactly 10 words or less.
+Include: selection, training, first mission, advancement, and final achievement.
+Return only a JSON object with the key "timeline": an array of 5 strings."""
+
+_ALL_TASKS = """You are a space historian and career counselor. Return only valid JSON objects.
+
+For the astronaut described, write:
+"biography": a brief, inspiring biography (2-3 sentences) that highlights their achievements.
+"timeline": 5 career milestones of exactly 10 words or less each, covering selection, training, first mission, advancement, and final achievement."""
+
+_ALL_SYSTEM = _ALL_TASKS + """
+
+Return only a JSON object with the keys "biography" (string) and "timeline" (array of 5 strings)."""
+
+_ALL_SYSTEM_WITH_ADVICE = _ALL_TASKS + """
+"advice": personalized career advice for the user described, as plain text. """ + _ADVICE_INSTRUCTIONS + """
+
+Return only a JSON object with the keys "biography" (string), "timeline" (array of 5 strings) and "advice" (string)."""
+
+def _astronaut_prompt(astronaut_name, nationality, mission_count, mission_duration, role):
+    return f"""Astronaut: {astronaut_name}
+Nationality: {nationality}
+Space missions: {mission_count}
+Days in space: {mission_duration}
+Role: {role}"""
+
+def _advice_prompt(user_profile, astronaut_match, similarity_score):
+    return f"""User Profile:
+- Name: {user_profile.get('name', 'Unknown')}
+- Age: {user_profile.get('age', 'Unknown')}
+- Nationality: {user_profile.get('nationality', 'Unknown')}
+- Education: {user_profile.get('education', [])}
+- Career Interests: {user_profile.get('occupations', [])}
+- Skills: {user_profile.get('skills', [])}
+- Interests: {user_profile.get('interests', [])}
+
+Matched Astronaut:
+- Name: {astronaut_match.get('name', 'Unknown')}
+- Similarity Score: {_as_score(similarity_score):.2f}
+- Education: {astronaut_match.get('education', [])}
+- Occupations: {astronaut_match.get('occupations', [])}
+- Time in Space: {astronaut_match.get('time_in_space', 'Unknown')}
+- Nationality: {astronaut_match.get('nationality', 'Unknown')}"""
+
 def generate_career_advice(user_profile, astronaut_match, similarity_score):
     """Generate AI-powered career advice using OpenAI"""
     
     # Check if OpenAI API key is available
     if not openai.api_key:
         log.info("OpenAI API key not configured, using fallback career advice")
-        return f"""
-        Based on your {similarity_score:.1%} similarity with {astronaut_match.get('name', 'this astronaut')}, 
-        you share a strong foundation for a space career. Your background in {', '.join(user_profile.get('occupations', ['your field']))} 
-        aligns well with the astronaut's path. Consider developing skills in leadership, technical expertise, 
-        and teamwork - all crucial for space missions. Pursue advanced education in STEM fields, gain 
-        experience in high-pressure environments, and consider military or research positions that build 
-        the resilience and expertise needed for space exploration.
-        """
+        return _fallback_advice(user_profile, astronaut_match, similarity_score)
     
     try:
-        prompt = f"""
-        You are an expert career counselor specializing in space careers and astronaut development. 
-        
-        User Profile:
-        - Name: {user_profile.get('name', 'Unknown')}
-        - Age: {user_profile.get('age', 'Unknown')}
-        - Nationality: {user_profile.get('nationality', 'Unknown')}
-        - Education: {user_profile.get('education', [])}
-        - Career Interests: {user_profile.get('occupations', [])}
-        - Skills: {user_profile.get('skills', [])}
-        - Interests: {user_profile.get('interests', [])}
-        
-        Matched Astronaut:
-        - Name: {astronaut_match.get('name', 'Unknown')}
-        - Similarity Score: {similarity_score:.2f}
-        - Education: {astronaut_match.get('education', [])}
-        - Occupations: {astronaut_match.get('occupations', [])}
-        - Time in Space: {astronaut_match.get('time_in_space', 'Unknown')}
-        - Nationality: {astronaut_match.get('nationality', 'Unknown')}
-        
-        Please provide personalized career advice in 2-3 paragraphs that:
-        1. Explains why this astronaut is a good match for the user
-        2. Provides specific recommendations for skills to develop
-        3. Suggests career paths or experiences to pursue
-        4. Includes motivational and inspiring language about space careers
-        
-        Make the advice practical, actionable, and encouraging. Focus on concrete next steps the user can take.
-        """
-        
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert career counselor specializing in space careers and astronaut development."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=500,
-            temperature=0.7
-        )
+        prompt = _advice_prompt(user_profile, astronaut_match, similarity_score)
         
-        return response.choices[0].message.content.strip()
+        return _chat(_ADVICE_SYSTEM, prompt, max_tokens=500)
         
     except Exception as e:
-        log.error(f"Error generating career advice with OpenAI: {e}")
-        return f"""
-        Based on your {similarity_score:.1%} similarity with {astronaut_match.get('name', 'this astronaut')}, 
-        you share a strong foundation for a space career. Your background in {', '.join(user_profile.get('occupations', ['your field']))} 
-        aligns well with the astronaut's path. Consider developing skills in leadership, technical expertise, 
-        and teamwork - all crucial for space missions. Pursue advanced education in STEM fields, gain 
-        experience in high-pressure environments, and consider military or research positions that build 
-        the resilience and expertise needed for space exploration.
-        """
+        log.error("Error generating career advice with OpenAI: %s", e)
+        return _fallback_advice(user_profile, astronaut_match, similarity_score)
+
+def _json_default(obj):
+    # Missing cells of Arrow-backed CSV columns (ASTRO_FAST_IO=1)
+    if obj is pd.NA:
+        return None
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _json(payload, status=200):
+    """JSON response serialized with orjson (numpy-aware) when installed, else Flask's jsonify"""
+    if ORJSON_AVAILABLE:
+        body = orjson.dumps(payload, default=_json_default,
+                           option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        return Response(body, status=status, mimetype='application/json')
+    return jsonify(payload), status
 
 # API Routes
+def _parse_top_k(value):
+    # JSON ints pass straight through; numeric strings/floats are coerced as before. None if not a positive integer
+    if type(value) is not int:
+        try:
+            value = int(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+    return value if value > 0 else None
+
+def _similar_astronauts_result(user_profile, top_k):
+    """Matching + CSV profile merge for /similar_astronauts. Returns (payload, status, complete), where
+    complete is False if a CSV lookup failed and the payload fell back to bare algorithm data"""
+    log.debug("🔍 CALLING MATCHING ALGORITHM...")
+    # One matching run with a few spare candidates; the spares back-fill an under-filled result
+    result = find_similar_astronauts(user_profile, top_k=top_k + 5)
+    log.debug("✅ Matching algorithm completed")
+
+    top_astronauts = result.get('top_astronauts', [])
+    if not isinstance(top_astronauts, list):
+        return {"error": "top_astronauts must be a list in the model result"}, 500, False
+    top_astronauts, backfill_astronauts = top_astronauts[:top_k], top_astronauts[top_k:]
+    role_scores = result.get('role_scores', {})
+    
+    log.debug("📊 MATCHING RESULTS: %d astronauts found, role scores: %s", len(top_astronauts), role_scores)
+    
+    if not top_astronauts:
+        log.debug("❌ NO ASTRONAUTS FOUND - This indicates a data loading or algorithm issue")
+    elif log.isEnabledFor(logging.DEBUG):
+        for i, astronaut in enumerate(top_astronauts[:3], 1):
+            log.debug("   %d. %s (similarity: %.4f)", i, astronaut.get('Profile.Name', 'Unknown'),
+                      astronaut.get('similarity', 0))
+    
+    log.debug("Original top_astronauts count: %d", len(top_astronauts))
+    if top_astronauts:
+        log.debug("First astronaut keys: %s", list(top_astronauts[0]))
+        log.debug("First astronaut similarity: %s", top_astronauts[0].get('similarity', 'NOT_FOUND'))
+
+    # Extract names from algorithm results and get full profiles from CSV
+    top_names = extract_names(top_astronauts)
+    if not top_names:
+        log.error("No names could be extracted from top_astronauts")
+        result['top_astronauts'] = []
+        return result, 200, True
+    
+    log.debug("Extracted names from algorithm: %s", top_names)
+    
+    complete = True
+    try:
+        # Get profiles mapped by normalized name
+        profiles_map = get_profiles_from_names(top_names, csv_path=CSV_PATH)
+        log.debug("CSV lookup returned %d profile matches", len(profiles_map))
+    except Exception as e:
+        log.error("CSV lookup failed: %s. Using algorithm data as fallback", e)
+        profiles_map = {}
+        complete = False
+
+    # Merge algorithm results with CSV profiles by name matching
+    final_profiles = []
+    for algorithm_astronaut in top_astronauts:
+        # Extract name exactly like extract_names() does
+        algorithm_name = algorithm_astronaut.get('Profile.Name') or algorithm_astronaut.get('Name') or algorithm_astronaut.get('name', '')
+        normalized_name = _normalize_name(algorithm_name)
+        similarity_score = algorithm_astronaut.get('similarity', 0.0)
+        
+        if normalized_name and normalized_name in profiles_map:
+            # Use CSV profile with algorithm similarity score
+            profile = profiles_map[normalized_name].copy()
+            profile['similarity'] = similarity_score
+            final_profiles.append(profile)
+            log.debug("✅ Merged: %s -> %s (similarity: %.4f)", algorithm_name, profile.get('Profile.Name', 'Unknown'), similarity_score)
+        else:
+            # Use algorithm result directly (will show as data unavailable for missions)
+            algorithm_astronaut['data_unavailable'] = True
+            final_profiles.append(algorithm_astronaut)
+            log.warning("⚠️  Using algorithm data only for: %s (similarity: %.4f)", algorithm_name, similarity_score)
+    
+    # Enforce exactly top_k results - pad with additional CSV entries if needed
+    if len(final_profiles) < top_k:
+        log.warning("Only found %d profiles, need %d. Attempting to backfill...", len(final_profiles), top_k)
+        
+        # Try to get additional high-similarity astronauts to meet top_k requirement
+        try:
+            profiles_map.update(get_profiles_from_names(extract_names(backfill_astronauts), csv_path=CSV_PATH))
+            
+            for backfill_astronaut in backfill_astronauts:
+                if len(final_profiles) >= top_k:
+                    break
+                
+                backfill_name = backfill_astronaut.get('Profile.Name') or backfill_astronaut.get('Name') or backfill_astronaut.get('name', '')
+                normalized_backfill = _normalize_name(backfill_name)
+                
+                if normalized_backfill and normalized_backfill in profiles_map:
+                    profile = profiles_map[normalized_backfill].copy()
+                    profile['similarity'] = backfill_astronaut.get('similarity', 0.0)
+                    final_profiles.append(profile)
+                    log.debug("✅ Backfilled: %s (similarity: %.4f)", backfill_name, profile['similarity'])
+                
+        except Exception as e:
+            log.error("Backfill attempt failed: %s", e)
+            complete = False
+    
+    result['top_astronauts'] = final_profiles[:top_k]
+
+    # Extract names for logging
+    astronaut_names = [astronaut.get('Profile.Name', astronaut.get('name', 'Unknown')) for astronaut in top_astronauts]
+    log.info("Top Names: %s", astronaut_names)
+    log.info("Result keys: %s", list(result.keys()))
+    return result, 200, complete
+
+class _UncachedResult(Exception):
+    """Carries an error or degraded (payload, status) out of _cached_similar_astronauts without caching it"""
+    def __init__(self, payload, status):
+        super().__init__(payload, status)
+        self.payload = payload
+        self.status = status
+
+@functools.lru_cache(maxsize=1024)
+def _cached_similar_astronauts(profile_key: str, top_k: int, data_mtimes):
+    """_similar_astronauts_result memoized on the canonical profile JSON and top_k. The CSV, model and
+    astronaut pickle mtimes are part of the key so reloaded data is never served stale. Only complete
+    200 results are cached: exceptions propagate, and error or degraded results raise _UncachedResult"""
+    payload, status, complete = _similar_astronauts_result(json.loads(profile_key), top_k)
+    if status != 200 or not complete:
+        raise _UncachedResult(payload, status)
+    return payload, status
+
+def _data_mtimes():
+    mtimes = []
+    for path in (CSV_PATH, MODEL_PATH, DF_PATH):
+        try:
+            mtimes.append(os.path.getmtime(path))
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
 @app.route('/similar_astronauts', methods=['POST'])
 def similar_astronauts():
-    print('=== BACKEND API CALL RECEIVED ===')
-    print(f'Request method: {request.method}')
-    print(f'Request path: {request.path}')
-    print(f'Content-Type: {request.content_type}')
+    log.debug("=== BACKEND API CALL RECEIVED === %s %s (Content-Type: %s)",
+              request.method, request.path, request.content_type)
     try:
         data = request.get_json(silent=True) or {}
-        print(f'Request data: {data}')
+        log.debug("Request data: %s", data)
         user_profile = data.get('user_profile')
         top_k = data.get('top_k', 3)
-        print(f'User profile: {user_profile}')
-        print(f'Top K: {top_k}')
+        log.debug("User profile: %s", user_profile)
+        log.debug("Top K: %s", top_k)
 
         if not isinstance(user_profile, dict):
-            return jsonify({"error": "user_profile must be a JSON object"}), 400
-        try:
-            top_k = int(top_k)
-        except (TypeError, ValueError):
-            return jsonify({"error": "top_k must be an integer"}), 400
-
-        print(f'\n🔍 CALLING MATCHING ALGORITHM...')
-        result = find_similar_astronauts(user_profile, top_k=top_k)
-        print(f'✅ Matching algorithm completed')
+            return _json({"error": "user_profile must be a JSON object"}, 400)
+        top_k = _parse_top_k(top_k)
+        if top_k is None:
+            return _json({"error": "top_k must be a positive integer"}, 400)
 
-        top_astronauts = result.get('top_astronauts', [])
-        role_scores = result.get('role_scores', {})
-        
-        print(f'\n📊 MATCHING RESULTS:')
-        print(f'   Number of astronauts found: {len(top_astronauts)}')
-        print(f'   Role scores: {role_scores}')
-        
-        if top_astronauts:
-            print(f'\n👨‍🚀 ASTRONAUT DETAILS:')
-            for i, astronaut in enumerate(top_astronauts[:3], 1):
-                name = astronaut.get('Profile.Name', 'Unknown')
-                similarity = astronaut.get('similarity', 0)
-                print(f'   {i}. {name} (similarity: {similarity:.4f})')
-        else:
-            print('\n❌ NO ASTRONAUTS FOUND - This indicates a data loading or algorithm issue')
-        
-        log.info(f"Original top_astronauts count: {len(top_astronauts)}")
-        if top_astronauts:
-            log.info(f"First astronaut keys: {list(top_astronauts[0].keys())}")
-            log.info(f"First astronaut similarity: {top_astronauts[0].get('similarity', 'NOT_FOUND')}")
-        
-        if not isinstance(top_astronauts, list):
-            return jsonify({"error": "top_astronauts must be a list in the model result"}), 500
-
-        # Extract names from algorithm results and get full profiles from CSV
-        top_names = extract_names(top_astronauts)
-        if not top_names:
-            log.error("No names could be extracted from top_astronauts")
-            result['top_astronauts'] = []
-            return jsonify(result)
-        
-        log.info(f"Extracted names from algorithm: {top_names}")
-        
+        # Identical profile + top_k give an identical response, so repeat submissions are served from memory
+        profile_key = json.dumps(user_profile, sort_keys=True, default=str)
         try:
-            # Get profiles mapped by normalized name
-            profiles_map = get_profiles_from_names(top_names, csv_path=CSV_PATH)
-            log.info(f"CSV lookup returned {len(profiles_map)} profile matches")
-        except Exception as e:
-            log.error(f"CSV lookup failed: {e}. Using algorithm data as fallback")
-            profiles_map = {}
-
-        # Merge algorithm results with CSV profiles by name matching
-        final_profiles = []
-        for algorithm_astronaut in top_astronauts:
-            # Extract name exactly like extract_names() does
-            algorithm_name = algorithm_astronaut.get('Profile.Name') or algorithm_astronaut.get('Name') or algorithm_astronaut.get('name', '')
-            normalized_name = _normalize_name(algorithm_name)
-            similarity_score = algorithm_astronaut.get('similarity', 0.0)
-            
-            if normalized_name and normalized_name in profiles_map:
-                # Use CSV profile with algorithm similarity score
-                profile = profiles_map[normalized_name].copy()
-                profile['similarity'] = similarity_score
-                final_profiles.append(profile)
-                log.info(f"✅ Merged: {algorithm_name} -> {profile.get('Profile.Name', 'Unknown')} (similarity: {similarity_score:.4f})")
-            else:
-                # Use algorithm result directly (will show as data unavailable for missions)
-                algorithm_astronaut['data_unavailable'] = True
-                final_profiles.append(algorithm_astronaut)
-                log.warning(f"⚠️  Using algorithm data only for: {algorithm_name} (similarity: {similarity_score:.4f})")
-        
-        # Enforce exactly top_k results - pad with additional CSV entries if needed
-        if len(final_profiles) < top_k:
-            log.warning(f"Only found {len(final_profiles)} profiles, need {top_k}. Attempting to backfill...")
-            
-            # Try to get additional high-similarity astronauts to meet top_k requirement
-            try:
-                backfill_result = find_similar_astronauts(user_profile, top_k=top_k + 5)  # Get more candidates
-                backfill_astronauts = backfill_result.get('top_astronauts', [])
-                
-                for backfill_astronaut in backfill_astronauts[len(final_profiles):]:
-                    if len(final_profiles) >= top_k:
-                        break
-                    
-                    backfill_name = backfill_astronaut.get('Profile.Name') or backfill_astronaut.get('Name') or backfill_astronaut.get('name', '')
-                    normalized_backfill = _normalize_name(backfill_name)
-                    
-                    if normalized_backfill and normalized_backfill in profiles_map:
-                        profile = profiles_map[normalized_backfill].copy()
-                        profile['similarity'] = backfill_astronaut.get('similarity', 0.0)
-                        final_profiles.append(profile)
-                        log.info(f"✅ Backfilled: {backfill_name} (similarity: {profile['similarity']:.4f})")
-                    
-            except Exception as e:
-                log.error(f"Backfill attempt failed: {e}")
-        
-        result['top_astronauts'] = final_profiles[:top_k]
-
-        # Extract names for logging
-        astronaut_names = [astronaut.get('Profile.Name', astronaut.get('name', 'Unknown')) for astronaut in top_astronauts]
-        log.info("Top Names: %s", astronaut_names)
-        log.info("Result keys: %s", list(result.keys()))
-        return jsonify(result)
+            payload, status = _cached_similar_astronauts(profile_key, top_k, _data_mtimes())
+        except _UncachedResult as r:
+            payload, status = r.payload, r.status
+        return _json(payload, status)
 
     except FileNotFoundError as e:
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        return _json({"error": str(e)}, 500)
     except KeyError as e:
         traceback.print_exc()
-        return jsonify({"error": f"CSV missing expected column: {e}"}), 500
+        return _json({"error": f"CSV missing expected column: {e}"}, 500)
     except Exception as e:
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        return _json({"error": str(e)}, 500)
 
 
 @app.route('/generate_advice', methods=['POST'])
@@ -366,16 +713,23 @@ def generate_advice():
         similarity_score = data.get('similarity_score', 0)
         
         if not user_profile or not astronaut_match:
-            return jsonify({"error": "user_profile and astronaut_match are required"}), 400
+            return _json({"error": "user_profile and astronaut_match are required"}, 400)
+        
+        # {"stream": true} sends the advice as server-sent events while it is generated
+        if data.get('stream') and openai.api_key:
+            return _sse_text(_chat_stream(_ADVICE_SYSTEM, _advice_prompt(user_profile, astronaut_match, similarity_score), max_tokens=500),
+                             _fallback_advice(user_profile, astronaut_match, similarity_score))
         
         advice = generate_career_advice(user_profile, astronaut_match, similarity_score)
+        if data.get('stream'):
+            return _sse_text([advice], advice)
         
-        return jsonify({"advice": advice})
+        return _json({"advice": advice})
         
     except Exception as e:
-        log.error(f"Error generating advice: {e}")
+        log.error("Error generating advice: %s", e)
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        return _json({"error": str(e)}, 500)
 
 @app.route('/generate_biography', methods=['POST'])
 def generate_biography():
@@ -390,42 +744,34 @@ def generate_biography():
         mission_duration = data.get('mission_duration', 0)
         role = data.get('role', 'Astronaut')
         
+        # {"stream": true} sends the biography as server-sent events while it is generated
+        if data.get('stream') and openai.api_key:
+            return _sse_text(_chat_stream(_BIOGRAPHY_SYSTEM, _astronaut_prompt(astronaut_name, nationality, mission_count, mission_duration, role), max_tokens=150),
+                             _fallback_biography(astronaut_name, nationality, mission_count, mission_duration, role))
+        
         # Check if OpenAI API key is available
         if not openai.api_key:
             log.info("OpenAI API key not configured, using fallback biography")
-            biography = f"{astronaut_name} is a distinguished astronaut from {nationality} with {mission_count} space missions and {mission_duration} days in space. Their role as {role} demonstrates their expertise and dedication to space exploration."
+            biography = _fallback_biography(astronaut_name, nationality, mission_count, mission_duration, role)
         else:
             try:
-                prompt = f"""
-                Write a brief, inspiring biography (2-3 sentences) for astronaut {astronaut_name} from {nationality}.
-                They have {mission_count} space missions and {mission_duration} days in space.
-                Their role was {role}.
-                Make it engaging and highlight their achievements.
-                """
-                
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a space historian writing inspiring astronaut biographies."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=150,
-                    temperature=0.7
-                )
+                prompt = _astronaut_prompt(astronaut_name, nationality, mission_count, mission_duration, role)
                 
-                biography = response.choices[0].message.content.strip()
+                biography = _chat(_BIOGRAPHY_SYSTEM, prompt, max_tokens=150)
                 
             except Exception as e:
-                log.error(f"Error generating biography with OpenAI: {e}")
+                log.error("Error generating biography with OpenAI: %s", e)
                 # Fallback biography
-                biography = f"{astronaut_name} is a distinguished astronaut from {nationality} with {mission_count} space missions and {mission_duration} days in space. Their role as {role} demonstrates their expertise and dedication to space exploration."
+                biography = _fallback_biography(astronaut_name, nationality, mission_count, mission_duration, role)
         
-        return jsonify({"biography": biography})
+        if data.get('stream'):
+            return _sse_text([biography], biography)
+        return _json({"biography": biography})
         
     except Exception as e:
-        log.error(f"Error generating biography: {e}")
+        log.error("Error generating biography: %s", e)
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        return _json({"error": str(e)}, 500)
 
 @app.route('/generate_career_timeline', methods=['POST'])
 def generate_career_timeline():
@@ -442,114 +788,213 @@ def generate_career_timeline():
         # Check if OpenAI API key is available
         if not openai.api_key:
             log.info("OpenAI API key not configured, using fallback timeline")
-            timeline = [
-                "Selected for astronaut training program",
-                "Completed intensive space mission preparation",
-                "First space mission launch", 
-                "Advanced to senior astronaut role",
-                "Retired from active space missions"
-            ]
+            timeline = list(_FALLBACK_TIMELINE)
         else:
             try:
-                prompt = f"""
-                Create 5 career milestones for astronaut {astronaut_name} who had {mission_count} missions and {mission_duration} days in space.
-                Each milestone should be exactly 10 words or less.
-                Include: selection, training, first mission, advancement, and final achievement.
-                Return as a JSON array of strings.
-                """
+                prompt = f"""Astronaut: {astronaut_name}
+Space missions: {mission_count}
+Days in space: {mission_duration}"""
                 
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a space career analyst. Return only valid JSON arrays."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=200,
-                    temperature=0.7
-                )
-                
-                timeline_text = response.choices[0].message.content.strip()
-                # Try to parse as JSON, fallback if it fails
+                timeline_text = _chat(_TIMELINE_SYSTEM, prompt, max_tokens=200, json_mode=True)
+                # Fall back if the reply isn't {"timeline": [...]} (e.g. cut off at max_tokens)
                 try:
-                    timeline = json.loads(timeline_text)
-                except:
-                    timeline = [
-                        "Selected for astronaut training program",
-                        "Completed intensive space mission preparation", 
-                        "First space mission launch",
-                        "Advanced to senior astronaut role",
-                        "Retired from active space missions"
-                    ]
+                    timeline = _loads_json(timeline_text).get('timeline')
+                except (ValueError, AttributeError) as e:
+                    log.warning("Unparseable timeline from OpenAI: %s", e)
+                    timeline = None
+                if not isinstance(timeline, list):
+                    timeline = list(_FALLBACK_TIMELINE)
                 
             except Exception as e:
-                log.error(f"Error generating timeline with OpenAI: {e}")
+                log.error("Error generating timeline with OpenAI: %s", e)
                 # Fallback timeline
-                timeline = [
-                    "Selected for astronaut training program",
-                    "Completed intensive space mission preparation",
-                    "First space mission launch", 
-                    "Advanced to senior astronaut role",
-                    "Retired from active space missions"
-                ]
+                timeline = list(_FALLBACK_TIMELINE)
         
-        return jsonify({"timeline": timeline})
+        return _json({"timeline": timeline})
         
     except Exception as e:
-        log.error(f"Error generating career timeline: {e}")
+        log.error("Error generating career timeline: %s", e)
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        return _json({"error": str(e)}, 500)
+
+def _generate_all_for(data):
+    """Biography, timeline and (optionally) advice for one astronaut request body; never raises on OpenAI errors"""
+    astronaut_name = data.get('astronaut_name', 'Unknown')
+    nationality = data.get('nationality', 'Unknown')
+    mission_count = data.get('mission_count', 0)
+    mission_duration = data.get('mission_duration', 0)
+    role = data.get('role', 'Astronaut')
+    user_profile = data.get('user_profile')
+    astronaut_match = data.get('astronaut_match')
+    similarity_score = data.get('similarity_score', 0)
+    with_advice = isinstance(user_profile, dict) and isinstance(astronaut_match, dict) and bool(user_profile and astronaut_match)
+
+    generated = None
+    if not openai.api_key:
+        log.info("OpenAI API key not configured, using fallback biography, timeline and advice")
+    else:
+        try:
+            system = _ALL_SYSTEM
+            prompt = _astronaut_prompt(astronaut_name, nationality, mission_count, mission_duration, role)
+            max_tokens = 350
+            if with_advice:
+                system = _ALL_SYSTEM_WITH_ADVICE
+                prompt += "\n\n" + _advice_prompt(user_profile, astronaut_match, similarity_score)
+                max_tokens += 500
+            generated = _loads_json(_chat(system, prompt, max_tokens=max_tokens, json_mode=True))
+        except Exception as e:
+            log.error("Error generating biography/timeline/advice with OpenAI: %s", e)
+    if not isinstance(generated, dict):
+        generated = {}
+
+    # Fallbacks are only built for fields the model left out or returned in the wrong shape
+    biography = generated.get("biography")
+    timeline = generated.get("timeline")
+    result = {
+        "biography": biography.strip() if isinstance(biography, str)
+                     else _fallback_biography(astronaut_name, nationality, mission_count, mission_duration, role),
+        "timeline": timeline if isinstance(timeline, list) else list(_FALLBACK_TIMELINE),
+    }
+    if with_advice:
+        advice = generated.get("advice")
+        result["advice"] = (advice.strip() if isinstance(advice, str)
+                            else _fallback_advice(user_profile, astronaut_match, similarity_score))
+    return result
+
+# Completions are network-bound, so a batch of astronauts is fanned out over threads that
+# share the pooled OpenAI session (pool_maxsize=32) instead of waiting on each in turn
+_openai_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="openai")
+# Most astronauts a single batch request may ask for, so one request can't queue unbounded
+# OpenAI calls against the shared rate-limit budget
+MAX_BATCH_SIZE = 50
+
+@app.route('/generate_all', methods=['POST'])
+def generate_all():
+    """
+    Generate an astronaut's biography and career timeline - plus career advice when
+    user_profile and astronaut_match are given - with a single OpenAI call.
+    With {"astronauts": [...]} (at most MAX_BATCH_SIZE entries) every entry is generated
+    concurrently and {"results": [...]} is returned in the same order.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        batch = data.get('astronauts')
+        if batch is None:
+            return _json(_generate_all_for(data))
+        if not isinstance(batch, list) or not all(isinstance(item, dict) for item in batch):
+            return _json({"error": "astronauts must be a list of JSON objects"}, 400)
+        if len(batch) > MAX_BATCH_SIZE:
+            return _json({"error": f"astronauts must have at most {MAX_BATCH_SIZE} entries"}, 400)
+        return _json({"results": list(_openai_pool.map(_generate_all_for, batch))})
+
+    except Exception as e:
+        log.error("Error generating biography/timeline/advice: %s", e)
+        traceback.print_exc()
+        return _json({"error": str(e)}, 500)
+
+# 150 completion tokens per biography keeps each call well under the model's 4096-token
+# completion limit; longer lists are split into several calls
+BIOGRAPHIES_PER_CALL = 25
+
+def _generate_biography_chunk(fields):
+    """Biographies for up to BIOGRAPHIES_PER_CALL astronauts from one OpenAI call; None entries where it gave none"""
+    prompt = "\n\n".join(f"{i}. {_astronaut_prompt(*f)}" for i, f in enumerate(fields, 1))
+    try:
+        generated = _loads_json(_chat(_BIOGRAPHIES_SYSTEM, prompt, max_tokens=150 * len(fields), json_mode=True))
+        generated = generated.get("biographies") if isinstance(generated, dict) else None
+    except Exception as e:
+        log.error("Error generating biographies with OpenAI: %s", e)
+        generated = None
+    if not isinstance(generated, list):
+        generated = []
+    return [bio.strip() if isinstance(bio, str) and bio.strip() else None
+            for bio in generated[:len(fields)]] + [None] * max(len(fields) - len(generated), 0)
+
+def _biography_fields(data):
+    return (data.get('astronaut_name', 'Unknown'), data.get('nationality', 'Unknown'),
+            data.get('mission_count', 0), data.get('mission_duration', 0), data.get('role', 'Astronaut'))
+
+@app.route('/generate_biographies', methods=['POST'])
+def generate_biographies():
+    """
+    Generate biographies for {"astronauts": [...]} (same fields as /generate_biography, at most
+    MAX_BATCH_SIZE entries) with one OpenAI call per BIOGRAPHIES_PER_CALL astronauts.
+    Returns {"biographies": [...]} in request order
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        batch = data.get('astronauts')
+        if not isinstance(batch, list) or not all(isinstance(item, dict) for item in batch):
+            return _json({"error": "astronauts must be a list of JSON objects"}, 400)
+        if len(batch) > MAX_BATCH_SIZE:
+            return _json({"error": f"astronauts must have at most {MAX_BATCH_SIZE} entries"}, 400)
+
+        fields = [_biography_fields(item) for item in batch]
+        biographies = [_fallback_biography(*f) for f in fields]
+        if not batch:
+            return _json({"biographies": biographies})
+
+        if not openai.api_key:
+            log.info("OpenAI API key not configured, using fallback biographies")
+            return _json({"biographies": biographies})
+
+        chunks = [fields[i:i + BIOGRAPHIES_PER_CALL] for i in range(0, len(fields), BIOGRAPHIES_PER_CALL)]
+        generated = [bio for chunk in _openai_pool.map(_generate_biography_chunk, chunks) for bio in chunk]
+        # Keep the fallback for any astronaut the model skipped or answered in the wrong shape
+        biographies = [bio if bio is not None else fallback for bio, fallback in zip(generated, biographies)]
+        return _json({"biographies": biographies})
+
+    except Exception as e:
+        log.error("Error generating biographies: %s", e)
+        traceback.print_exc()
+        return _json({"error": str(e)}, 500)
+
+@functools.lru_cache(maxsize=1)
+def _suit_image_data_url() -> str:
+    """The plain astronaut suit as a PNG data URL, read and encoded once (a missing file is retried)"""
+    with open(SUIT_IMAGE_PATH, "rb") as f:
+        return "data:image/png;base64," + base64.b64encode(f.read()).decode('utf-8')
 
 @app.route('/process_face_swap', methods=['POST'])
 def process_face_swap_endpoint():
     """
-    Process face swapping with astronaut suit helmet - WITH COMPREHENSIVE CONSOLE LOGGING
+    Process face swapping with astronaut suit helmet (step-by-step logging at LOG_LEVEL=DEBUG)
     """
     try:
-        print(f'\n🎭 FACE SWAPPING API CALLED')
+        log.debug("🎭 FACE SWAPPING API CALLED")
         data = request.get_json(silent=True) or {}
         selfie_data = data.get('selfie', '')
         
-        print(f'📷 Selfie data received: {"✅ Yes" if selfie_data else "❌ No"}')
-        if selfie_data:
-            print(f'📏 Selfie data length: {len(selfie_data)} characters')
-            print(f'🎨 Data format: {selfie_data[:50]}...')
+        log.debug("📷 Selfie data received: %s", "✅ Yes" if selfie_data else "❌ No")
         
         if not selfie_data:
-            print('❌ No selfie data provided - returning error')
-            return jsonify({"error": "No selfie data provided"}), 400
+            log.debug("❌ No selfie data provided - returning error")
+            return _json({"error": "No selfie data provided"}, 400)
             
-        print(f'🔄 Processing face swap...')
+        log.debug("📏 Selfie data length: %d characters, format: %s...", len(selfie_data), selfie_data[:50])
         # Process face swap with detailed logging
         result_image = process_face_swap(selfie_data)
         
         if result_image:
-            print(f'✅ Face swap successful!')
-            print(f'📤 Returning processed image (length: {len(result_image)} chars)')
-            return jsonify({"astronaut_image": result_image})
+            log.debug("✅ Face swap successful, returning processed image (length: %d chars)", len(result_image))
+            return _json({"astronaut_image": result_image})
         else:
-            print('⚠️  Face swap failed - returning astronaut suit fallback')
+            log.info("⚠️  Face swap failed - returning astronaut suit fallback")
             # Return original astronaut suit if face swap fails
-            import base64
-            with open("frontend/public/astronaut-suit.png", "rb") as f:
-                suit_data = base64.b64encode(f.read()).decode('utf-8')
-                fallback_result = f"data:image/png;base64,{suit_data}"
-                print(f'📤 Returning fallback image (length: {len(fallback_result)} chars)')
-                return jsonify({"astronaut_image": fallback_result})
+            return _json({"astronaut_image": _suit_image_data_url()})
                 
     except Exception as e:
-        print(f'❌ ERROR in face swap endpoint: {e}')
-        log.error(f"Error in face swap endpoint: {e}")
+        log.error("Error in face swap endpoint: %s", e)
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        return _json({"error": str(e)}, 500)
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
+    return _json({"status": "healthy", "timestamp": datetime.now().isoformat()})
 
 if __name__ == '__main__':
     # Backend runs on port 3001, frontend proxies to it so user sees everything on port 5000
     port = int(os.environ.get('PORT', 3001))
-    print(f"\n🚀 Starting Backend API on port {port}")
-    print(f"📊 Console logging enabled for comprehensive debugging")
-    print(f"🌐 Frontend proxies to this backend - everything appears on port 5000 to user")
-    app.run(debug=True, port=port, host='0.0.0.0')
+    log.info("🚀 Starting Backend API on port %d (frontend proxies to it on port 5000); LOG_LEVEL=DEBUG for per-request detail", port)
+    # Debug mode (reloader + debugger) only when asked for with FLASK_DEV=1; deploy with gunicorn (see Procfile)
+    app.run(debug=os.getenv('FLASK_DEV') == '1', port=port, host='0.0.0.0', threaded=True)
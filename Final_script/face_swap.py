@@ -2,17 +2,38 @@ import cv2
 import numpy as np
 import base64
 from io import BytesIO
+import functools
 import logging
+import os
 
 log = logging.getLogger(__name__)
 
-# Try to import PIL, fallback if not available
+# Pillow is optional: it only reads the selfie's header so the decode can be downscaled
 try:
     from PIL import Image
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
-    log.warning("PIL/Pillow not available, face swap will use fallback")
+
+_REDUCED_READS = ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2))
+
+def decode_image(image_bytes: bytes, min_size=None):
+    """
+    Decode image bytes straight to a BGR array with OpenCV (None if undecodable).
+    With min_size=(width, height), large images are decoded at 1/2, 1/4 or 1/8 scale
+    (libjpeg DCT scaling for JPEGs), never below min_size; this needs Pillow for the size.
+    """
+    flag = cv2.IMREAD_COLOR
+    if min_size is not None and PIL_AVAILABLE:
+        try:
+            width, height = Image.open(BytesIO(image_bytes)).size  # header only
+        except Exception:
+            width = height = 0
+        for factor, reduced in _REDUCED_READS:
+            if width // factor >= min_size[0] and height // factor >= min_size[1]:
+                flag = reduced
+                break
+    return cv2.imdecode(np.frombuffer(image_bytes, np.uint8), flag)
 
 def process_face_swap(selfie_base64: str, astronaut_suit_path: str = None) -> str:
     """
@@ -27,88 +48,68 @@ def process_face_swap(selfie_base64: str, astronaut_suit_path: str = None) -> st
     """
     # Set default path relative to project root - use new spacesuit
     if astronaut_suit_path is None:
-        import os
         astronaut_suit_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'frontend', 'public', 'new-astronaut-suit.png')
     
-    print(f'\n🎭 === FACE SWAP PROCESSING START ===')
-    print(f'📷 Selfie data provided: {"✅ Yes" if selfie_base64 else "❌ No"}')
-    print(f'🛠️  Astronaut suit path: {astronaut_suit_path}')
-    if selfie_base64:
-        print(f'📏 Data length: {len(selfie_base64)} characters')
+    log.debug("🎭 Face swap: selfie %d characters, suit %s", len(selfie_base64 or ""), astronaut_suit_path)
     try:
-        # Check if PIL is available
-        if not PIL_AVAILABLE:
-            log.warning("PIL not available, returning astronaut suit fallback")
-            return encode_astronaut_suit_fallback()
-            
         # Decode the selfie image
         if not selfie_base64 or 'data:image' not in selfie_base64:
             log.warning("Invalid or missing selfie data")
             return encode_astronaut_suit_fallback()
             
-        # Remove data URL prefix and decode
-        image_data = selfie_base64.split(',')[1]
-        selfie_bytes = base64.b64decode(image_data)
-        
-        # Convert to OpenCV format
-        selfie_pil = Image.open(BytesIO(selfie_bytes))
-        selfie_cv = cv2.cvtColor(np.array(selfie_pil), cv2.COLOR_RGB2BGR)
-        
         # Load astronaut suit image
         suit_img = cv2.imread(astronaut_suit_path)
         if suit_img is None:
-            log.error(f"Could not load astronaut suit image from {astronaut_suit_path}")
+            log.error("Could not load astronaut suit image from %s", astronaut_suit_path)
             return None
             
         # Get suit dimensions for background sizing
         suit_height, suit_width = suit_img.shape[:2]
         
+        # Remove data URL prefix and decode (partition: no list, and only the payload is copied)
+        _, _, image_data = selfie_base64.partition(',')
+        selfie_bytes = base64.b64decode(image_data)
+        
+        # Decode straight to BGR. Phone photos are often several times the suit's size, so
+        # let the decoder downscale while decoding
+        selfie_cv = decode_image(selfie_bytes, (suit_width, suit_height))
+        if selfie_cv is None:
+            log.warning("Could not decode selfie image")
+            return None
+        
         # Resize user's selfie to match suit dimensions (as background)
         background_img = cv2.resize(selfie_cv, (suit_width, suit_height))
         
-        # Load suit image with alpha channel (transparency)
-        # If the suit image doesn't have alpha channel, we'll create one
-        if suit_img.shape[2] == 3:  # BGR image without alpha
-            # Convert suit to BGRA
-            suit_bgra = cv2.cvtColor(suit_img, cv2.COLOR_BGR2BGRA)
+        # Overlay the suit on top of the background: every suit pixel that is not fully
+        # transparent replaces the background, so the transparent helmet visor shows the
+        # user's photo behind. A suit image without an alpha channel is treated as opaque.
+        result_img = background_img.copy()
+        if suit_img.shape[2] == 4:
+            opaque = suit_img[:, :, 3] > 0
+            result_img[opaque] = suit_img[:, :, :3][opaque]
         else:
-            suit_bgra = suit_img
-        
-        # Convert background to BGRA as well
-        background_bgra = cv2.cvtColor(background_img, cv2.COLOR_BGR2BGRA)
-        
-        # Create the composite image - background (user photo) with suit overlay
-        result_img = background_bgra.copy()
-        
-        # Overlay the suit on top of the background
-        # The transparent areas in the helmet will show the user's photo behind
-        for y in range(suit_height):
-            for x in range(suit_width):
-                # If suit pixel is not completely transparent
-                suit_pixel = suit_bgra[y, x]
-                if len(suit_pixel) >= 4 and suit_pixel[3] > 0:  # Has alpha and not transparent
-                    result_img[y, x] = suit_pixel
-                # Otherwise keep the background (user's photo)
-        
-        # Convert back to BGR for final output
-        result_img = cv2.cvtColor(result_img, cv2.COLOR_BGRA2BGR)
+            result_img[:] = suit_img
         
         return encode_image_to_base64(result_img)
         
     except Exception as e:
-        log.error(f"Error in face swap processing: {e}")
+        log.error("Error in face swap processing: %s", e)
         return None
 
 
 def encode_image_to_base64(cv_image):
-    """Convert OpenCV image to base64 string."""
-    _, buffer = cv2.imencode('.png', cv_image)
+    """Convert OpenCV image to base64 string.
+
+    The composite is an opaque photo, so it is sent as JPEG: several times faster to encode
+    than PNG's DEFLATE and a fraction of the size once base64-encoded.
+    """
+    _, buffer = cv2.imencode('.jpg', cv_image, [cv2.IMWRITE_JPEG_QUALITY, 85])
     image_base64 = base64.b64encode(buffer).decode('utf-8')
-    return f"data:image/png;base64,{image_base64}"
+    return f"data:image/jpeg;base64,{image_base64}"
 
-def encode_astronaut_suit_fallback():
-    """Return base64 encoded astronaut suit image as fallback."""
-    import os
+@functools.lru_cache(maxsize=1)
+def _astronaut_suit_data_url():
+    """Read and base64-encode the first astronaut suit found; cached, raises if none exists."""
     # Try multiple possible paths for new astronaut suit
     possible_paths = [
         os.path.join(os.path.dirname(os.path.dirname(__file__)), 'frontend', 'public', 'new-astronaut-suit.png'),
@@ -121,14 +122,21 @@ def encode_astronaut_suit_fallback():
     
     for path in possible_paths:
         try:
-            print(f'🔍 Trying astronaut suit path: {path}')
             with open(path, "rb") as f:
                 suit_data = base64.b64encode(f.read()).decode('utf-8')
-                print(f'✅ Successfully loaded astronaut suit from: {path}')
+                log.debug("✅ Loaded astronaut suit from: %s", path)
                 return f"data:image/png;base64,{suit_data}"
         except Exception as e:
-            print(f'❌ Failed to load from {path}: {e}')
+            log.debug("❌ Failed to load astronaut suit from %s: %s", path, e)
             continue
     
-    print('❌ Could not find astronaut suit image in any expected location')
-    return None
\ No newline at end of file
+    raise FileNotFoundError("astronaut suit image not found in any expected location")
+
+def encode_astronaut_suit_fallback():
+    """Return base64 encoded astronaut suit image as fallback."""
+    # Encoded once per process; a missing file is not cached, so it is picked up once it appears
+    try:
+        return _astronaut_suit_data_url()
+    except FileNotFoundError:
+        log.error("❌ Could not find astronaut suit image in any expected location")
+        return None
@@ -14,34 +14,57 @@ def _alias_module(real_mod_name: str, fake_mod_name: str):
     fake_mod.__dict__.update(real_mod.__dict__)
     sys.modules[fake_mod_name] = fake_mod
 
-# Provide a package-like placeholder for 'numpy._core'
-if "numpy._core" not in sys.modules:
-    pkg = types.ModuleType("numpy._core")
-    pkg.__path__ = []  # make it package-like
-    sys.modules["numpy._core"] = pkg
-
-# Map old -> new locations
-# numeric
-_alias_module("numpy.core.numeric", "numpy._core.numeric")
-
-# multiarray (NumPy >=1.16 consolidated into _multiarray_umath)
-# Try both possibilities to satisfy old pickles
-_alias_module("numpy.core.multiarray", "numpy._core.multiarray")
-_alias_module("numpy.core._multiarray_umath", "numpy._core._multiarray_umath")
-# some old objects reference 'numpy._core.umath' too — map it to the same impl
-_alias_module("numpy.core._multiarray_umath", "numpy._core.umath")
+_numpy_shim_installed = False
+
+def _install_numpy_shim():
+    """
+    Let NumPy 1.x unpickle data written under NumPy 2 (which references numpy._core.*).
+    Run lazily, only once a pickle load has failed on the missing module; NumPy 2 needs nothing.
+    """
+    global _numpy_shim_installed
+    if _numpy_shim_installed:
+        return
+    _numpy_shim_installed = True
+    if int(_np.__version__.split(".")[0]) >= 2:
+        return
+
+    # Provide a package-like placeholder for 'numpy._core'
+    if "numpy._core" not in sys.modules:
+        pkg = types.ModuleType("numpy._core")
+        pkg.__path__ = []  # make it package-like
+        sys.modules["numpy._core"] = pkg
+
+    # Map old -> new locations
+    # numeric
+    _alias_module("numpy.core.numeric", "numpy._core.numeric")
+
+    # multiarray (NumPy >=1.16 consolidated into _multiarray_umath)
+    # Try both possibilities to satisfy old pickles
+    _alias_module("numpy.core.multiarray", "numpy._core.multiarray")
+    _alias_module("numpy.core._multiarray_umath", "numpy._core._multiarray_umath")
 # ---- end shim ----
 
 
+import os
+import functools
+import logging
+
 import numpy as np
 import pandas as pd
 from gensim.models import Word2Vec
-from sklearn.metrics.pairwise import cosine_similarity
 from typing import Dict, List, Any
 
+log = logging.getLogger(__name__)
+
+# Default paths relative to the project root
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "word2vec_people_categories.model")
+DF_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Data Analysis", "astronauts_with_roles.pkl")
+
 # Helper functions (copied from models_test)
+# Bounded: this module serves arbitrary user input in the API process
+@functools.lru_cache(maxsize=4096)
 def phrase_token(s: str) -> str:
-        return "_".join(s.strip().lower().split())
+        return "_".join(s.lower().split())
 
 def extract_category_tokens(rec: Dict) -> Dict[str, List[str]]:
         edu_tokens = []
@@ -60,11 +83,23 @@ def extract_category_tokens(rec: Dict) -> Dict[str, List[str]]:
                 "nationality": nat_tokens,
         }
 
+@functools.lru_cache(maxsize=4096)
+def _mean_vector_cached(model: Word2Vec, tokens: tuple) -> np.ndarray:
+        """Category mean per (model, tokens); the same nationality/occupation lists recur across queries."""
+        kv = model.wv
+        # Gather all known token rows in one fancy-index instead of a per-token lookup
+        idx = np.fromiter((kv.key_to_index.get(t, -1) for t in tokens), dtype=np.int64, count=len(tokens))
+        idx = idx[idx >= 0]
+        if not idx.size:
+                vec = np.zeros(model.vector_size, dtype=np.float32)
+        else:
+                vec = kv.vectors[idx].mean(axis=0).astype(np.float32, copy=False)
+        # Shared between callers, so keep it read-only
+        vec.flags.writeable = False
+        return vec
+
 def mean_vector(model: Word2Vec, tokens: List[str]) -> np.ndarray:
-        vecs = [model.wv[t] for t in tokens if t in model.wv]
-        if not vecs:
-                return np.zeros(model.vector_size, dtype=np.float32)
-        return np.mean(vecs, axis=0)
+        return _mean_vector_cached(model, tuple(tokens))
 
 def embed_person(model: Word2Vec, rec: Dict, cat_weights=None) -> np.ndarray:
         if cat_weights is None:
@@ -76,6 +111,99 @@ def embed_person(model: Word2Vec, rec: Dict, cat_weights=None) -> np.ndarray:
         v_nat = mean_vector(model, cats["nationality"]) * cat_weights["nationality"]
         return np.concatenate([v_edu, v_occ, v_int, v_nat], axis=0)
 
+_CATEGORIES = ("education", "occupation", "interest", "nationality")
+
+def embed_persons(model: Word2Vec, recs: List[Dict], cat_weights=None) -> np.ndarray:
+        """
+        Batched embed_person: (len(recs), 4*D) float32, row i equal to embed_person(model, recs[i]).
+        All known tokens are gathered in one fancy index and the (record, category) means
+        come out of a single reduceat over their runs.
+        """
+        if cat_weights is None:
+                cat_weights = {"education":1.0, "occupation":1.0, "interest":0.5, "nationality":0.7}
+        kv = model.wv
+        idx, starts, slots = [], [], []
+        for r, rec in enumerate(recs):
+                cats = extract_category_tokens(rec)
+                for c, cat in enumerate(_CATEGORIES):
+                        known = [kv.key_to_index[t] for t in cats[cat] if t in kv.key_to_index]
+                        if known:
+                                starts.append(len(idx))
+                                slots.append(r * len(_CATEGORIES) + c)
+                                idx.extend(known)
+        # Empty categories stay zero, matching mean_vector's fallback
+        out = np.zeros((len(recs) * len(_CATEGORIES), model.vector_size), dtype=np.float32)
+        if idx:
+                starts = np.asarray(starts)
+                counts = np.diff(np.append(starts, len(idx)))
+                sums = np.add.reduceat(kv.vectors[np.asarray(idx)], starts, axis=0)
+                out[slots] = sums / counts[:, None]
+        weights = np.array([cat_weights[cat] for cat in _CATEGORIES], dtype=np.float32)
+        out *= np.tile(weights, len(recs))[:, None]
+        return out.reshape(len(recs), len(_CATEGORIES) * model.vector_size)
+
+def _top_indices(sims: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k largest sims in descending order, without sorting the whole array."""
+        if k >= len(sims):
+                return np.argsort(-sims)
+        part = np.argpartition(-sims, k - 1)[:k]
+        return part[np.argsort(-sims[part])]
+
+def _iter_ranked(sims: np.ndarray, head: np.ndarray):
+        """Yield the pre-ranked head first, then sort the remaining rows only if they are needed."""
+        yield from head
+        if len(head) < len(sims):
+                rest = np.ones(len(sims), dtype=bool)
+                rest[head] = False
+                rest = np.flatnonzero(rest)
+                yield from rest[np.argsort(-sims[rest])]
+
+@functools.lru_cache(maxsize=2)
+def _load_model(model_path: str, mtime: float) -> Word2Vec:
+        """Word2Vec model, loaded once per (path, mtime) instead of on every query."""
+        # Cached means hold a reference to the previous model; drop them on reload
+        _mean_vector_cached.cache_clear()
+        return Word2Vec.load(model_path)
+
+@functools.lru_cache(maxsize=4)
+def _load_astronauts(df_path: str, mtime: float):
+        """
+        Load the astronaut pickle and split it into parallel arrays:
+        X (N, 4*D) contiguous float32 embeddings, names, and the DataFrame itself,
+        which is only touched when a matched row is rendered.
+        Rows of X are L2-normalized so cosine similarity is a single dot product.
+        roles is (per-row role code, sorted role names, rows per role); rows without
+        a role get the code len(names) so they fall outside every role.
+        """
+        try:
+                df = pd.read_pickle(df_path)
+        except ModuleNotFoundError:
+                # Pickle written under NumPy 2; only then alias numpy._core and retry
+                _install_numpy_shim()
+                df = pd.read_pickle(df_path)
+        # Copy each row into one preallocated float32 buffer instead of vstack + cast
+        embs = df["embedding_concat"].values
+        X = np.empty((len(embs), len(embs[0]) if len(embs) else 0), dtype=np.float32)
+        for i, v in enumerate(embs):
+                X[i] = v
+        X /= np.clip(np.linalg.norm(X, axis=1, keepdims=True), 1e-12, None)
+        names = ["" if n is None else str(n) for n in df["name"].tolist()]
+        codes, role_names = pd.factorize(df["roles"], sort=True)
+        codes = np.where(codes >= 0, codes, len(role_names))
+        role_counts = np.bincount(codes, minlength=len(role_names))[:len(role_names)]
+        return df, X, names, (codes, list(role_names), role_counts)
+
+def preload(model_path: str = None, df_path: str = None) -> None:
+        """
+        Load the Word2Vec model and astronaut matrix into their caches now rather than on
+        the first request. Called at import by the servers so that a gunicorn --preload
+        master shares them copy-on-write with every worker process.
+        """
+        model_path = model_path or MODEL_PATH
+        df_path = df_path or DF_PATH
+        _load_model(model_path, os.path.getmtime(model_path))
+        _load_astronauts(df_path, os.path.getmtime(df_path))
+
 def find_similar_astronauts(user_profile: Dict[str, Any],
                                                         model_path: str = None,
                                                         df_path: str = None,
@@ -84,135 +212,86 @@ def find_similar_astronauts(user_profile: Dict[str, Any],
         Given a user profile dict, return top_k most similar astronauts and role similarity scores.
         Returns a dict with keys: 'top_astronauts', 'role_scores'.
         """
-        import os
+        model_path = model_path or MODEL_PATH
+        df_path = df_path or DF_PATH
         
-        # Set default paths relative to current file location
-        if model_path is None:
-            model_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "word2vec_people_categories.model")
-        if df_path is None:
-            df_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Data Analysis", "astronauts_with_roles.pkl")
+        # Step-by-step diagnostics are logged at DEBUG (LOG_LEVEL=DEBUG); the stats below are only
+        # computed when that level is on
+        debug = log.isEnabledFor(logging.DEBUG)
+        log.debug("🤖 === ASTRONAUT MATCHING ALGORITHM START ===")
+        model = _load_model(model_path, os.path.getmtime(model_path))
+        log.debug("✅ Word2Vec model from %s: %d dimensions", model_path, model.vector_size)
         
-        # Load model and data with comprehensive logging
-        print(f'\n🤖 === ASTRONAUT MATCHING ALGORITHM START ===')
-        print(f'📁 Loading Word2Vec model from: {model_path}')
-        model = Word2Vec.load(model_path)
-        print(f'✅ Model loaded successfully: {model.vector_size} dimensions')
-        
-        print(f'📁 Loading astronaut data from: {df_path}')
-        df = pd.read_pickle(df_path)
-        print(f'✅ Astronaut data loaded: {len(df)} records')
-        print(f'📊 Data columns: {list(df.columns)}')
+        df, X, names, roles = _load_astronauts(df_path, os.path.getmtime(df_path))
+        log.debug("✅ Astronaut data from %s: %d records", df_path, len(df))
         
         # Embed user
-        print(f'\n👤 Processing user profile:')
-        print(f'   Name: {user_profile.get("name", "N/A")}')
-        print(f'   Nationality: {user_profile.get("nationality", "N/A")}')
-        print(f'   Education: {user_profile.get("education", [])}')
-        print(f'   Occupations: {user_profile.get("occupations", [])}')
-        print(f'   Interests: {user_profile.get("interests", [])}')
-        
-        print(f'🔄 Creating user embedding...')
+        if debug:
+            log.debug("👤 User profile: name=%s nationality=%s education=%s occupations=%s interests=%s",
+                      user_profile.get("name", "N/A"), user_profile.get("nationality", "N/A"),
+                      user_profile.get("education", []), user_profile.get("occupations", []),
+                      user_profile.get("interests", []))
         user_emb = embed_person(model, user_profile)
-        print(f'✅ User embedding created: shape={user_emb.shape}, non-zero elements={np.count_nonzero(user_emb)}')
+        if debug:
+            log.debug("✅ User embedding created: shape=%s, non-zero elements=%d",
+                      user_emb.shape, np.count_nonzero(user_emb))
         
-        # Role similarity
-        print(f'\n🎯 Calculating role similarities...')
-        role_groups = df.groupby("roles")
+        # One GEMV scores every astronaut; role scores are means over row subsets of it
+        u = user_emb / max(np.linalg.norm(user_emb), 1e-12)
+        sims = X @ u
+
+        # Role similarity: every role's mean in one bincount over the role codes
+        role_codes, role_names, role_counts = roles
+        role_means = np.bincount(role_codes, weights=sims, minlength=len(role_names))[:len(role_names)] / role_counts
         role_corr = {}
-        print(f'   Available roles: {list(role_groups.groups.keys())}')
-        for role, group in role_groups:
-                role_embs = np.vstack(group["embedding_concat"].values)
-                sims = cosine_similarity(user_emb.reshape(1, -1), role_embs).ravel()
-                role_score = float(np.mean(sims)) if len(sims) > 0 else 0.0
-                role_corr[role] = role_score
-                print(f'   {role}: {role_score:.3f} (from {len(group)} astronauts)')
-                role_corr = {role: round(score, 2) for role, score in role_corr.items()}
+        for role, role_score, count in zip(role_names, role_means.tolist(), role_counts.tolist()):
+                role_corr[role] = round(role_score, 2)
+                log.debug("   %s: %.3f (from %d astronauts)", role, role_score, count)
 
         # Astronaut similarity
-        print(f'\n🚀 Calculating individual astronaut similarities...')
-        astro_mat = np.vstack(df["embedding_concat"].values)
-        print(f'📊 Astronaut matrix shape: {astro_mat.shape}')
-        sims = cosine_similarity(user_emb.reshape(1, -1), astro_mat).ravel()
-        print(f'📊 Similarity scores calculated: {len(sims)} scores')
-        print(f'   Max similarity: {np.max(sims):.4f}')
-        print(f'   Min similarity: {np.min(sims):.4f}')
-        print(f'   Mean similarity: {np.mean(sims):.4f}')
+        if debug:
+            log.debug("📊 %d similarity scores: max=%.4f min=%.4f mean=%.4f",
+                      len(sims), np.max(sims), np.min(sims), np.mean(sims))
         
         # Get unique astronauts by name to avoid duplicates
-        print(f'\n🔍 Filtering for unique astronauts...')
         seen_names = set()
         top_astronauts = []
         
-        # Sort by similarity score (descending) and get unique astronauts
-        sorted_indices = np.argsort(-sims)
-        print(f'📊 Top 10 similarity scores: {sims[sorted_indices[:10]]}')
+        # Rank only a small head of the scores (duplicate names may need a few extra);
+        # the rest is sorted lazily if the head runs out
+        sorted_indices = _top_indices(sims, max(4 * top_k, 10))
+        if debug:
+            log.debug("📊 Top 10 similarity scores: %s", sims[sorted_indices[:10]])
         
         astronauts_checked = 0
-        for idx in sorted_indices:
+        for idx in _iter_ranked(sims, sorted_indices):
                 astronauts_checked += 1
                 if len(top_astronauts) >= top_k:
                         break
                         
-                astro = df.iloc[idx].to_dict()
                 # Fix: Use 'name' field which exists in the data, not 'Profile.Name'
-                astro_name = astro.get('name', '')
-                
-                if astronauts_checked <= 5:  # Debug first 5
-                    print(f'   Checking astronaut {astronauts_checked}: "{astro_name}" (similarity: {sims[idx]:.4f})')
+                astro_name = names[idx]
                 
                 # Skip if we've already seen this astronaut or if name is empty
-                if astro_name in seen_names:
-                    if astronauts_checked <= 5:
-                        print(f'     SKIPPED: Already seen this astronaut')
-                    continue
-                elif not astro_name.strip():
-                    if astronauts_checked <= 5:
-                        print(f'     SKIPPED: Empty astronaut name')
+                if astro_name in seen_names or not astro_name.strip():
+                    if debug and astronauts_checked <= 5:
+                        log.debug("   SKIPPED %d: %r (duplicate or empty name)", astronauts_checked, astro_name)
                     continue
                         
                 seen_names.add(astro_name)
+                # Only the selected rows are materialized from the DataFrame
+                astro = df.iloc[idx].to_dict()
                 astro["similarity"] = float(sims[idx])
                 astro = {k: v for k, v in astro.items() if k != "embedding_concat"}
                 top_astronauts.append(astro)
-                if astronauts_checked <= 5:
-                    print(f'     ADDED: "{astro_name}" to results')
         
-        # If we don't have enough unique astronauts, fill with remaining unique ones
-        if len(top_astronauts) < top_k:
-                for idx in sorted_indices:
-                        if len(top_astronauts) >= top_k:
-                                break
-                                
-                        astro = df.iloc[idx].to_dict()
-                        astro_name = astro.get('Profile.Name', '')
-                        
-                        # Skip if we've already seen this astronaut or if name is empty
-                        if astro_name in seen_names or not astro_name.strip():
-                                continue
-                                
-                        seen_names.add(astro_name)
-                        astro["similarity"] = float(sims[idx])
-                        # Keep 'name' field and add 'Profile.Name' for compatibility with frontend
-                        astro['Profile.Name'] = astro_name
-                        astro = {k: v for k, v in astro.items() if k != "embedding_concat"}
-                        top_astronauts.append(astro)
-        
-        print(f'\n🎆 MATCHING COMPLETE!')
-        print(f'   Total astronauts checked: {astronauts_checked}')
-        print(f'   Unique astronauts found: {len(top_astronauts)}')
-        print(f'   Requested top_k: {top_k}')
-        
-        if top_astronauts:
-            print(f'\n🏆 TOP MATCHES:')
-            for i, astronaut in enumerate(top_astronauts, 1):
-                name = astronaut.get('Profile.Name', 'Unknown')
-                similarity = astronaut.get('similarity', 0)
-                print(f'   {i}. {name} (similarity: {similarity:.4f})')
-        else:
-            print(f'\n❌ NO MATCHES FOUND! This indicates a data or algorithm issue.')
-            print(f'   Check if embedding_concat column exists and has valid data.')
+        if debug:
+            log.debug("🎆 MATCHING COMPLETE: checked %d, found %d unique (top_k=%d): %s",
+                      astronauts_checked, len(top_astronauts), top_k,
+                      [(a.get('name', 'Unknown'), round(a.get('similarity', 0), 4)) for a in top_astronauts])
+        if not top_astronauts:
+            log.warning("❌ No astronaut matches found; check that embedding_concat has valid data")
         
-        print(f'\n🤖 === ASTRONAUT MATCHING ALGORITHM END ===\n')
         return {"top_astronauts": top_astronauts, "role_scores": role_corr}
 
 # print(find_similar_astronauts(
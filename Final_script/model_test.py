@@ -33,20 +33,21 @@ _alias_module("numpy.core._multiarray_umath", "numpy._core.umath")
 # ---- end shim ----
 # Code above written by ChatGPT to temporarily resolve a conflict in numpy versions on my comp
 
+import functools
 import json
 from pathlib import Path
 from typing import List, Dict
 import numpy as np
 import pandas as pd
 from gensim.models import Word2Vec
-from sklearn.metrics.pairwise import cosine_similarity
 import joblib
 
 # -------------------------
 # Helpers
 # -------------------------
+@functools.lru_cache(maxsize=None)
 def phrase_token(s: str) -> str:
-    return "_".join(s.strip().lower().split())
+    return "_".join(s.lower().split())
 
 def extract_category_tokens(rec: Dict) -> Dict[str, List[str]]:
     # Education: take institution names
@@ -74,11 +75,14 @@ def extract_category_tokens(rec: Dict) -> Dict[str, List[str]]:
     }
 
 def mean_vector(model: Word2Vec, tokens: List[str]) -> np.ndarray:
-    vecs = [model.wv[t] for t in tokens if t in model.wv]
-    if not vecs:
+    kv = model.wv
+    # Gather all known token rows in one fancy-index instead of a per-token lookup
+    idx = np.fromiter((kv.key_to_index.get(t, -1) for t in tokens), dtype=np.int64, count=len(tokens))
+    idx = idx[idx >= 0]
+    if not idx.size:
         # if no tokens present (e.g., empty interests), return zeros
         return np.zeros(model.vector_size, dtype=np.float32)
-    return np.mean(vecs, axis=0)
+    return kv.vectors[idx].mean(axis=0).astype(np.float32, copy=False)
 
 def embed_person(model: Word2Vec, rec: Dict, cat_weights=None) -> np.ndarray:
     if cat_weights is None:
@@ -130,30 +134,36 @@ user_profile_non_astronaut = {
 
 user_emb = embed_person(astronaut_model, user_profile_non_astronaut)
 
-# ---------- Calculate similarity profile for each role ----------
-# Group astronauts by their roles
-role_groups = df.groupby("roles")
+# L2-normalize the astronaut rows once so cosine similarity is a single dot product
+astro_mat = np.ascontiguousarray(np.vstack(df["embedding_concat"].values), dtype=np.float32)  # (N, 4*vector_size)
+astro_norm = astro_mat / np.clip(np.linalg.norm(astro_mat, axis=1, keepdims=True), 1e-12, None)
+u = user_emb / max(np.linalg.norm(user_emb), 1e-12)                                 # (4*vector_size,)
+
+# ---------- Similarity computation ----------
+sims = astro_norm @ u                                                               # (N,)
 
-# Calculate average cross-correlation (cosine similarity) for each role
-role_corr = {}
-for role, group in role_groups:
-    role_embs = np.vstack(group["embedding_concat"].values)
-    sims = cosine_similarity(user_emb.reshape(1, -1), role_embs).ravel()
-    role_corr[role] = np.mean(sims) if len(sims) > 0 else 0.0
+# ---------- Calculate similarity profile for each role ----------
+# Average cross-correlation (cosine similarity) for each role, as two bincount passes over the one similarity pass
+role_codes, role_names = pd.factorize(df["roles"], sort=True)
+has_role = role_codes >= 0  # rows without a role fall outside every role
+role_corr = pd.Series(
+    np.bincount(role_codes[has_role], weights=sims[has_role], minlength=len(role_names))
+    / np.bincount(role_codes[has_role], minlength=len(role_names)),
+    index=role_names,
+)
 
 # Output cross-correlation values for each role
 print("Average cross-correlation (cosine similarity) for each role:")
 for role, avg_corr in role_corr.items():
     print(f"{role}: {avg_corr:.3f}")
 
-# ---------- Similarity computation ----------
-astro_mat = np.vstack(df["embedding_concat"].values)  
-user_mat = user_emb.reshape(1, -1)                             
-sims = cosine_similarity(user_mat, astro_mat).ravel()            
-
 top_k = 3
-rank_idx = np.argsort(-sims)[:top_k]
+# Partial selection of the top_k rows, then sort only those
+part = np.argpartition(-sims, top_k - 1)[:top_k]
+rank_idx = part[np.argsort(-sims[part])]
 
+# One slice for all top_k rows instead of a df.iloc lookup per rank
+top_rows = df.iloc[rank_idx]
 print("Top similar astronauts:")
-for rank, idx in enumerate(rank_idx, 1):
-    print(f"{rank}. {df.iloc[idx]}: similarity={sims[idx]:.3f}")
\ No newline at end of file
+for rank, ((_, row), sim) in enumerate(zip(top_rows.iterrows(), sims[rank_idx]), 1):
+    print(f"{rank}. {row}: similarity={sim:.3f}")
\ No newline at end of file
@@ -1,15 +1,25 @@
+import functools
 import json
+import os
+import tempfile
 from pathlib import Path
 from typing import List, Dict
 import numpy as np
 import pandas as pd
 from gensim.models import Word2Vec
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 
 # Helpers
+@functools.lru_cache(maxsize=None)
 def phrase_token(s: str) -> str:
-    return "_".join(s.strip().lower().split())
+    return "_".join(s.lower().split())
 
 def extract_category_tokens(rec: Dict) -> Dict[str, List[str]]:
     # Education: take institution names
@@ -36,67 +46,76 @@ def extract_category_tokens(rec: Dict) -> Dict[str, List[str]]:
         "nationality": nat_tokens,
     }
 
-def record_to_sentence(rec: Dict) -> List[str]:
-    cats = extract_category_tokens(rec)
+def cats_to_sentence(cats: Dict[str, List[str]]) -> List[str]:
     return cats["education"] + cats["occupation"] + cats["interest"] + cats["nationality"]
 
-def mean_vector(model: Word2Vec, tokens: List[str]) -> np.ndarray:
-    vecs = [model.wv[t] for t in tokens if t in model.wv]
-    if not vecs:
-        return np.zeros(model.vector_size, dtype=np.float32)
-    return np.mean(vecs, axis=0)
+CATEGORIES = ("education", "occupation", "interest", "nationality")
+
+def embed_records(model: Word2Vec, cats_list: List[Dict[str, List[str]]]) -> np.ndarray:
+    # One sparse row per (record, category) holding 1/len(tokens) at each token's
+    # vocab index, so every category mean comes out of a single sparse @ dense product
+    kv = model.wv
+    rows, cols, vals = [], [], []
+    for r, cats in enumerate(cats_list):
+        for c, cat in enumerate(CATEGORIES):
+            idx = [kv.key_to_index[t] for t in cats[cat] if t in kv.key_to_index]
+            if idx:
+                rows.extend([r * len(CATEGORIES) + c] * len(idx))
+                cols.extend(idx)
+                vals.extend([1.0 / len(idx)] * len(idx))
+    M = sparse.csr_matrix(
+        (np.asarray(vals, dtype=np.float32), (rows, cols)),
+        shape=(len(cats_list) * len(CATEGORIES), len(kv.index_to_key)),
+    )
+    # Empty categories (no known tokens) are all-zero rows
+    return np.asarray(M @ kv.vectors, dtype=np.float32).reshape(len(cats_list), -1)
+
+def load_jsonl(path: Path) -> List[Dict]:
+    # Read the file in one go and parse each non-blank line (orjson when available)
+    return [_json_loads(line) for line in path.read_bytes().splitlines() if line.strip()]
 
 
 # Load training data data
 jsonl_path = Path("../astronauts_structured_fixed.jsonl")
 jsonl_non_astronauts_path = Path("../non_astronauts_600.jsonl")
 
-sentences: List[List[str]] = []
-records: List[Dict] = []
-
-with open(jsonl_path, "r", encoding="utf-8") as f:
-    for line in f:
-        if not line.strip():
-            continue
-        rec = json.loads(line)
-        records.append(rec)
-        sentences.append(record_to_sentence(rec))
-
-with open(jsonl_non_astronauts_path, "r", encoding="utf-8") as f:
-    for line in f:
-        if not line.strip():
-            continue
-        rec = json.loads(line)
-        records.append(rec)
-        sentences.append(record_to_sentence(rec))
+records: List[Dict] = load_jsonl(jsonl_path) + load_jsonl(jsonl_non_astronauts_path)
+# Extract each record's category tokens once; reused for the embedding table below
+cats_list: List[Dict[str, List[str]]] = [extract_category_tokens(rec) for rec in records]
+sentences: List[List[str]] = [cats_to_sentence(cats) for cats in cats_list]
 
 # -------------------------
 # Train Model
-model = Word2Vec(
-    sentences=sentences,
-    vector_size=100,
-    window=5,
-    min_count=1,      
-    workers=4,
-    sg=1,             
-    epochs=200
-)
-
-model.save("word2vec_people_categories.model")
+# Stream the corpus from disk (one space-separated sentence per line) so gensim
+# splits it across workers without feeding them through a single Python thread.
+# The corpus is a temporary file next to the model output, removed once training is done
+model_path = Path("word2vec_people_categories.model")
+with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".txt", prefix="w2v_corpus_",
+                                 dir=model_path.parent, delete=False) as f:
+    f.writelines(" ".join(s) + "\n" for s in sentences)
+    corpus_path = Path(f.name)
+
+try:
+    model = Word2Vec(
+        corpus_file=str(corpus_path),
+        vector_size=100,
+        window=5,
+        min_count=1,      
+        workers=os.cpu_count() or 4,
+        sg=1,             
+        epochs=200
+    )
+finally:
+    corpus_path.unlink()
+
+model.save(str(model_path))
 
 # ------------------------- Astronaut vectors' table -------------------------
 # Build per-person embeddings by category and a concatenated feature
-rows = []
-for rec in records:
-    cats = extract_category_tokens(rec)
-    v_edu = mean_vector(model, cats["education"])
-    v_occ = mean_vector(model, cats["occupation"])
-    v_int = mean_vector(model, cats["interest"])
-    v_nat = mean_vector(model, cats["nationality"])
-
-    # Concatenate the four category vectors into one feature vector
-    v_concat = np.concatenate([v_edu, v_occ, v_int, v_nat], axis=0)
+embeddings = embed_records(model, cats_list)  # (N, 4 * vector_size)
 
+rows = []
+for rec, cats, v_concat in zip(records, cats_list, embeddings):
     rows.append({
         "name": rec.get("name"),
         "education_tokens": cats["education"],
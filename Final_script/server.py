@@ -1,25 +1,46 @@
 # server.py
-from flask import Flask, request, jsonify
-from final_functions import find_similar_astronauts
+from flask import Flask, request, jsonify, Response
+from final_functions import find_similar_astronauts, preload as preload_matching
 import traceback
+import bisect
+import functools
+import os
 import pandas as pd
 import logging
 from typing import List, Dict, Any
+from collections import defaultdict
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 app = Flask(__name__)
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
 log = logging.getLogger(__name__)
 
 CSV_PATH = '/Users/harjyot/Desktop/code/Model/Data Analysis/astronauts.csv'  # adjust if needed
 
+# Opt-in pyarrow CSV reader (ASTRO_FAST_IO=1); otherwise pandas' default C parser
+CSV_ENGINE = "c"
+if os.getenv('ASTRO_FAST_IO') == '1':
+    try:
+        import pyarrow  # noqa: F401
+        CSV_ENGINE = "pyarrow"
+    except ImportError:
+        log.warning("ASTRO_FAST_IO=1 but pyarrow is not installed; using the default CSV parser")
+
 import re
 
-SUFFIXES = {"jr", "jr.", "sr", "sr.", "ii", "iii", "iv", "v"}
+SUFFIXES = frozenset({"jr", "jr.", "sr", "sr.", "ii", "iii", "iv", "v"})
+_TOKEN_RE = re.compile(r"[^\w\-']")
 
 def _norm_token(s: str) -> str:
     # lower, strip spaces, remove periods and extra punctuation
-    return re.sub(r"[^\w\-']", "", s.casefold()).strip()
+    return _TOKEN_RE.sub("", s.casefold()).strip()
 
+@functools.lru_cache(maxsize=8192)
 def _split_candidate_name(full: str):
     # model: "Aleksandr Ivanchenkov" → first="aleksandr", last="ivanchenkov"
     parts = full.strip().split()
@@ -32,23 +53,39 @@ def _split_candidate_name(full: str):
         return first, None
     return first, last
 
-def _split_csv_name(csv_name: str):
-    # CSV: "Glenn, John H., Jr." → last="glenn", first="john"
+def _split_csv_names(csv_names: pd.Series):
+    # CSV: "Glenn, John H., Jr." → last="glenn", first="john" (suffixes ignored)
     # CSV: "Carpenter, M. Scott" → last="carpenter", first="m"
-    # CSV: "Glenn, John H., Jr." (ignore suffix)
-    left, sep, right = csv_name.partition(",")
-    last = _norm_token(left) if sep else _norm_token(csv_name)
-    first = ""
-    if sep:
-        # remove suffixes and keep the *first* given name token
-        right_tokens = [_norm_token(t) for t in right.strip().split()]
-        right_tokens = [t for t in right_tokens if t and t not in SUFFIXES]
-        first = right_tokens[0] if right_tokens else ""
-    return first, last  # normalized
+    # No comma: the whole name is the last name. Normalized (first, last), run through pandas .str ops
+    parts = csv_names.fillna("").astype(str).str.partition(",")
+    left, sep, right = parts[0], parts[1], parts[2]
+    last = left.str.casefold().str.replace(_TOKEN_RE, "", regex=True).str.strip()
+    # one row per given-name token; keep the first non-empty, non-suffix token per name
+    tokens = right.where(sep != "", "").str.split().explode()
+    tokens = tokens.str.casefold().str.replace(_TOKEN_RE, "", regex=True).str.strip()
+    tokens = tokens[tokens.notna() & (tokens != "") & ~tokens.isin(SUFFIXES)]
+    first = tokens.groupby(level=0).first().reindex(csv_names.index, fill_value="")
+    return first, last
 
-def get_profiles_from_names(names: List[str], csv_path: str = CSV_PATH) -> List[Dict[str, Any]]:
+def _rows_by_last(df: pd.DataFrame):
+    # ___norm_last -> [(___norm_first, row position), ...] in CSV row order
+    buckets = defaultdict(list)
+    for pos, (first, last) in enumerate(zip(df['___norm_first'], df['___norm_last'])):
+        buckets[last].append((first, pos))
+    return buckets
+
+def _prefix_slice(sorted_keys: List[str], prefix: str) -> slice:
+    # Range of sorted_keys that start with prefix (bisect to the first, walk to the last)
+    lo = hi = bisect.bisect_left(sorted_keys, prefix)
+    while hi < len(sorted_keys) and sorted_keys[hi].startswith(prefix):
+        hi += 1
+    return slice(lo, hi)
+
+@functools.lru_cache(maxsize=1)
+def _load_profiles(csv_path: str, mtime: float):
+    # Read, normalize and bucket the CSV once per (path, mtime)
     try:
-        df = pd.read_csv(csv_path)
+        df = pd.read_csv(csv_path, engine=CSV_ENGINE)
     except FileNotFoundError:
         raise FileNotFoundError(f"CSV not found at {csv_path}")
 
@@ -57,47 +94,78 @@ def get_profiles_from_names(names: List[str], csv_path: str = CSV_PATH) -> List[
 
     # Precompute normalized first/last for the CSV once
     if '___norm_first' not in df.columns or '___norm_last' not in df.columns:
-        norm_first, norm_last = [], []
-        for raw in df['Profile.Name'].fillna(""):
-            f, l = _split_csv_name(str(raw))
-            norm_first.append(f)
-            norm_last.append(l)
-        df['___norm_first'] = norm_first
-        df['___norm_last']  = norm_last
+        df['___norm_first'], df['___norm_last'] = _split_csv_names(df['Profile.Name'])
+
+    # Bucket rows by last name; each name then only checks its own bucket.
+    # Sorted last names and (first, position) pairs serve the prefix lookups via bisect.
+    by_last = _rows_by_last(df)
+    last_keys = sorted(by_last)
+    firsts = sorted(zip(df['___norm_first'], range(len(df))))
+    first_keys = [first for first, _ in firsts]
+    first_pos = [pos for _, pos in firsts]
+    # Integer id per distinct Profile.Name (one CSV row per mission), so dedup needs no string compares
+    person_ids = pd.factorize(df['Profile.Name'])[0].tolist()
+    # Rows as plain dicts, built once in one columnar pass; responses copy from here
+    records = df.to_dict(orient='records')
+    return records, by_last, last_keys, first_keys, first_pos, person_ids
+
+def _get_profiles_table(csv_path: str = CSV_PATH):
+    # Cached CSV table; re-read only when the file's mtime changes
+    try:
+        mtime = os.path.getmtime(csv_path)
+    except OSError:
+        raise FileNotFoundError(f"CSV not found at {csv_path}")
+    return _load_profiles(csv_path, mtime)
+
+def get_profiles_from_names(names: List[str], csv_path: str = CSV_PATH) -> List[Dict[str, Any]]:
+    if not names:
+        return []
+    records, by_last, last_keys, first_keys, first_pos, person_ids = _get_profiles_table(csv_path)
 
+    # Row positions to return, first row per person in match order
     wanted = []
+    seen = set()
+    tried = set()
     for name in names:
         if not isinstance(name, str) or not name.strip():
             continue
         cf, cl = _split_candidate_name(name)
         if cf is None:  # empty after normalization
             continue
+        # Repeats of an already resolved (first, last) can only add people already in the result
+        if (cf, cl) in tried:
+            continue
+        tried.add((cf, cl))
 
-        # Build a mask: exact last match AND first startswith
-        mask = True
-        if cl:
-            mask = mask & (df['___norm_last'] == cl)
+        # exact last match AND first startswith
         # allow first initial or prefix match (e.g., "John" vs "J." or "Johnny")
-        mask = mask & (df['___norm_first'].str.startswith(cf))
-
-        matches = df[mask]
-
-        # If nothing with exact last name, try a looser fallback: last startswith
-        if matches.empty and cl:
-            mask2 = (df['___norm_last'].str.startswith(cl)) & (df['___norm_first'].str.startswith(cf))
-            matches = df[mask2]
-
-        if not matches.empty:
-            wanted.append(matches)
-
-    if not wanted:
-        return []
-
-    out = pd.concat(wanted, ignore_index=True)
-    # Drop exact duplicate people if they exist
-    out = out.drop_duplicates(subset=['Profile.Name'])
-    return out.to_dict(orient='records')
-
+        if cl:
+            matches = [pos for first, pos in by_last.get(cl, ()) if first.startswith(cf)]
+            # If nothing with exact last name, try a looser fallback: last startswith
+            if not matches:
+                matches = sorted(pos for last in last_keys[_prefix_slice(last_keys, cl)]
+                                 for first, pos in by_last[last] if first.startswith(cf))
+        else:
+            matches = sorted(first_pos[_prefix_slice(first_keys, cf)])
+
+        # Drop exact duplicate people if they exist
+        for pos in matches:
+            if person_ids[pos] not in seen:
+                seen.add(person_ids[pos])
+                wanted.append(pos)
+
+    return [dict(records[pos]) for pos in wanted]
+
+# Load the CSV and matching model at startup so the first request doesn't pay for them
+try:
+    _get_profiles_table()
+except (FileNotFoundError, KeyError) as e:
+    log.warning("Astronaut CSV not preloaded: %s", e)
+# Any load failure is logged, not raised, so a bad model/pickle only breaks /similar_astronauts
+try:
+    preload_matching()
+except Exception as e:
+    log.warning("Matching model not preloaded: %s", e)
 
 def extract_names(items: List[Dict[str, Any]]) -> List[str]:
     names = []
@@ -108,6 +176,22 @@ def extract_names(items: List[Dict[str, Any]]) -> List[str]:
             names.append(n.strip())
     return names
 
+def _json(payload, status=200):
+    # orjson (numpy-aware) when installed, else Flask's jsonify
+    if ORJSON_AVAILABLE:
+        body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        return Response(body, status=status, mimetype='application/json')
+    return jsonify(payload), status
+
+def _parse_top_k(value):
+    # JSON ints pass straight through; numeric strings/floats are coerced as before. None if not a positive integer
+    if type(value) is not int:
+        try:
+            value = int(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+    return value if value > 0 else None
+
 @app.route('/similar_astronauts', methods=['POST'])
 def similar_astronauts():
     try:
@@ -116,11 +200,10 @@ def similar_astronauts():
         top_k = data.get('top_k', 3)
 
         if not isinstance(user_profile, dict):
-            return jsonify({"error": "user_profile must be a JSON object"}), 400
-        try:
-            top_k = int(top_k)
-        except (TypeError, ValueError):
-            return jsonify({"error": "top_k must be an integer"}), 400
+            return _json({"error": "user_profile must be a JSON object"}, 400)
+        top_k = _parse_top_k(top_k)
+        if top_k is None:
+            return _json({"error": "top_k must be a positive integer"}, 400)
 
         # Call your similarity function
         result = find_similar_astronauts(user_profile, top_k=top_k)
@@ -128,36 +211,36 @@ def similar_astronauts():
         # Be defensive about structure
         top_astronauts = result.get('top_astronauts', [])
         if not isinstance(top_astronauts, list):
-            return jsonify({"error": "top_astronauts must be a list in the model result"}), 500
+            return _json({"error": "top_astronauts must be a list in the model result"}, 500)
 
         # Extract names robustly (handles 'Name' vs 'name')
         top_names = extract_names(top_astronauts)
         if not top_names:
             # Keep the original structure so the client still gets role_scores, etc.
             result['top_astronauts'] = []
-            return jsonify(result)
+            return _json(result)
 
         # Fetch full profiles from the CSV using 'Name' column
         full_profiles = get_profiles_from_names(top_names, csv_path=CSV_PATH)
-        print("Full Profiles\n\n\n:")
-        print(full_profiles)
+        log.debug("Full Profiles: %s", full_profiles)
         # Replace with full profiles
         result['top_astronauts'] = full_profiles
 
         log.info("Top Names: %s", top_names)
         log.info("Result keys: %s", list(result.keys()))
-        return jsonify(result)
+        return _json(result)
 
     except FileNotFoundError as e:
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        return _json({"error": str(e)}, 500)
     except KeyError as e:
         traceback.print_exc()
-        return jsonify({"error": f"CSV missing expected column: {e}"}), 500
+        return _json({"error": f"CSV missing expected column: {e}"}, 500)
     except Exception as e:
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        return _json({"error": str(e)}, 500)
 
 if __name__ == '__main__':
     # Set host to 0.0.0.0 if you want LAN access
-    app.run(debug=True, port=4000)
+    # Debug mode (reloader + debugger) only when asked for with FLASK_DEV=1
+    app.run(debug=os.getenv('FLASK_DEV') == '1', port=4000, threaded=True)
@@ -0,0 +1,3 @@
+# WSGI entry point for production servers, e.g.
+#   gunicorn --pythonpath Final_script -w 4 -k gthread --threads 4 --preload -b 0.0.0.0:3001 wsgi:app
+from enhanced_server import app